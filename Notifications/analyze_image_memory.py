@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+import os
+import sys
+import struct
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# PNG color types as stored in the IHDR chunk
+COLOR_TYPE_NAMES = {
+    0: "L",
+    2: "RGB",
+    3: "P",
+    4: "LA",
+    6: "RGBA",
+}
+
+# Bytes per pixel once UIImage(named:) has decoded the image for 8-bit
+# sources. CoreGraphics keeps grayscale as a single channel but expands RGB
+# and palette images to a 4-byte RGBX/RGBA buffer.
+DECODED_BYTES_PER_PIXEL = {
+    0: 1,
+    2: 4,
+    3: 4,
+    4: 2,
+    6: 4,
+}
+
+# Images whose decoded size is above this are flagged (1 MB by default)
+DEFAULT_BUDGET = 1024 * 1024
+
+
+def read_png_header(path):
+    """
+    Read width, height, bit depth and color type from a PNG's IHDR chunk
+    without decoding any pixel data.
+    """
+    with open(path, "rb") as f:
+        header = f.read(26)
+
+    if len(header) < 26 or header[:8] != PNG_SIGNATURE or header[12:16] != b"IHDR":
+        raise ValueError(f"{path} is not a valid PNG file")
+
+    width, height, bit_depth, color_type = struct.unpack(">IIBB", header[16:26])
+    return width, height, bit_depth, color_type
+
+
+def decoded_size(width, height, bit_depth, color_type):
+    """Estimate the in-memory size of a decoded image in bytes."""
+    bytes_per_pixel = DECODED_BYTES_PER_PIXEL.get(color_type, 4)
+    if bit_depth == 16:
+        bytes_per_pixel *= 2
+    return width * height * bytes_per_pixel
+
+
+def iter_imageset_pngs(assets_dir):
+    """Yield (imageset name, png path) for every PNG in an asset catalog."""
+    for root, dirs, files in os.walk(assets_dir):
+        dirs.sort()
+        if not root.endswith(".imageset"):
+            continue
+        name = os.path.splitext(os.path.basename(root))[0]
+        for filename in sorted(files):
+            if filename.lower().endswith(".png"):
+                yield name, os.path.join(root, filename)
+
+
+def analyze_assets(assets_dir):
+    """
+    Collect header information and decoded memory estimates for every
+    imageset in the catalog.
+    """
+    results = []
+    for name, path in iter_imageset_pngs(assets_dir):
+        try:
+            width, height, bit_depth, color_type = read_png_header(path)
+        except ValueError as e:
+            print(f"Warning: {e}")
+            continue
+
+        results.append({
+            "name": name,
+            "path": path,
+            "width": width,
+            "height": height,
+            "mode": COLOR_TYPE_NAMES.get(color_type, "?"),
+            "file_bytes": os.path.getsize(path),
+            "decoded_bytes": decoded_size(width, height, bit_depth, color_type),
+        })
+    return results
+
+
+def suggest_mode(path, max_colors=256):
+    """
+    Inspect an image's pixels and return the smallest mode it can be stored
+    in without visible change, or None if it is already minimal.
+    """
+    import numpy as np
+    from PIL import Image
+
+    with Image.open(path) as img:
+        mode = img.mode
+        if mode not in ("RGB", "RGBA"):
+            return None
+        pixels = np.asarray(img)
+
+    if mode == "RGBA":
+        if (pixels[..., 3] != 255).any():
+            return None
+        pixels = pixels[..., :3]
+
+    if ((pixels[..., 0] == pixels[..., 1]) & (pixels[..., 1] == pixels[..., 2])).all():
+        return "L"
+
+    # Pack each pixel into a single integer so unique colors can be counted
+    # without building a Python set of tuples
+    packed = (pixels[..., 0].astype(np.uint32) << 16) | (pixels[..., 1].astype(np.uint32) << 8) | pixels[..., 2]
+    if len(np.unique(packed)) <= max_colors:
+        return "P"
+
+    return "RGB" if mode == "RGBA" else None
+
+
+def rewrite_image(path, target_mode):
+    """Rewrite an image in place using a smaller pixel mode."""
+    import numpy as np
+    from PIL import Image
+
+    with Image.open(path) as img:
+        img = img.convert("RGB")
+
+    if target_mode == "P":
+        # Build the palette from the exact set of colors so the rewrite is
+        # lossless, rather than letting a quantizer approximate it
+        pixels = np.asarray(img)
+        colors, indices = np.unique(pixels.reshape(-1, 3), axis=0, return_inverse=True)
+        img = Image.fromarray(indices.reshape(pixels.shape[:2]).astype(np.uint8), "P")
+        img.putpalette(colors.astype(np.uint8).tobytes())
+    elif target_mode == "L":
+        img = img.convert("L")
+
+    tmp_path = path + ".tmp"
+    img.save(tmp_path, "PNG", optimize=True)
+    os.replace(tmp_path, path)
+
+
+def format_bytes(size):
+    """Format a byte count for display."""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python analyze_image_memory.py <assets_dir> [budget_bytes] [--rewrite]")
+        sys.exit(1)
+
+    assets_dir = sys.argv[1]
+    rewrite = "--rewrite" in sys.argv[2:]
+    args = [arg for arg in sys.argv[2:] if arg != "--rewrite"]
+    budget = int(args[0]) if args else DEFAULT_BUDGET
+
+    if not os.path.isdir(assets_dir):
+        print(f"Error: {assets_dir} is not a valid directory")
+        sys.exit(1)
+
+    results = analyze_assets(assets_dir)
+    results.sort(key=lambda r: r["decoded_bytes"], reverse=True)
+
+    total_file = sum(r["file_bytes"] for r in results)
+    total_decoded = sum(r["decoded_bytes"] for r in results)
+    over_budget = [r for r in results if r["decoded_bytes"] > budget]
+
+    for r in over_budget:
+        print(f"⚠️ {r['name']}: {r['width']}x{r['height']} {r['mode']} "
+              f"decodes to {format_bytes(r['decoded_bytes'])} (budget {format_bytes(budget)})")
+
+    print(f"Analyzed {len(results)} images")
+    print(f"Total file size: {format_bytes(total_file)}")
+    print(f"Total decoded memory: {format_bytes(total_decoded)}")
+    print(f"Images over budget: {len(over_budget)}")
+
+    if not rewrite:
+        return
+
+    color_types = {name: color_type for color_type, name in COLOR_TYPE_NAMES.items()}
+    rewritten = 0
+    saved = 0
+    disk_only = []
+    for r in results:
+        target_mode = suggest_mode(r["path"])
+        if target_mode is None:
+            continue
+        # RGB, P and RGBA all decode to 4 bytes per pixel, so only rewrites
+        # that shrink the decoded buffer are worth touching the file for
+        if decoded_size(r["width"], r["height"], 8, color_types[target_mode]) >= r["decoded_bytes"]:
+            disk_only.append(f"{r['name']} ({r['mode']} -> {target_mode})")
+            continue
+        rewrite_image(r["path"], target_mode)
+        width, height, bit_depth, color_type = read_png_header(r["path"])
+        saved += r["decoded_bytes"] - decoded_size(width, height, bit_depth, color_type)
+        print(f"Rewrote {r['name']}: {r['mode']} -> {target_mode}")
+        rewritten += 1
+
+    print(f"Rewrote {rewritten} images, saving {format_bytes(saved)} of decoded memory")
+    if disk_only:
+        print(f"Left {len(disk_only)} images unchanged whose smaller mode would only shrink the file on disk:")
+        for entry in disk_only:
+            print(f"  {entry}")
+
+
+if __name__ == "__main__":
+    main()
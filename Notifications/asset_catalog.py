@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+import os
+import re
+import sys
+import copy
+import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+CONTENTS_FILE = "Contents.json"
+
+# Key Xcode uses in an imageset's "properties" for On-Demand Resources tags
+ODR_TAGS_KEY = "on-demand-resource-tags"
+
+CATALOG_INFO = {
+    "version": 1,
+    "author": "xcode"
+}
+
+# Icon filenames follow "<idiom>_<points>pt@<scale>.png", e.g. "ipad_83.5pt@2x.png"
+ICON_FILENAME_PATTERN = re.compile(r"^(?P<idiom>.+)_(?P<points>[\d.]+)pt@(?P<scale>\d+x)\.png$")
+
+
+def imageset_contents(filename):
+    """Contents.json for a universal imageset with a single 1x image."""
+    return {
+        "images": [
+            {
+                "idiom": "universal",
+                "filename": filename,
+                "scale": "1x"
+            },
+            {
+                "idiom": "universal",
+                "scale": "2x"
+            },
+            {
+                "idiom": "universal",
+                "scale": "3x"
+            }
+        ],
+        "info": dict(CATALOG_INFO)
+    }
+
+
+def appiconset_contents(icon_sizes):
+    """
+    Contents.json for an app icon set, derived from the same filename to
+    pixel size table that drives icon rendering.
+    """
+    images = []
+    for filename, pixels in icon_sizes.items():
+        match = ICON_FILENAME_PATTERN.match(filename)
+        if not match:
+            raise ValueError(f"Cannot derive icon metadata from filename: {filename}")
+
+        points = match.group("points")
+        scale = match.group("scale")
+        if float(points) * int(scale[:-1]) != pixels:
+            raise ValueError(f"{filename} is {pixels}px, which does not match {points}pt@{scale}")
+
+        images.append({
+            "idiom": match.group("idiom"),
+            "scale": scale,
+            "size": f"{points}x{points}",
+            "filename": filename
+        })
+
+    return {
+        "images": images,
+        "info": {
+            "author": "xcode",
+            "version": 1
+        }
+    }
+
+
+class CatalogEntry:
+    """The Contents.json of one folder in the asset catalog."""
+
+    def __init__(self, path, contents, exists=True):
+        self.path = path
+        self.contents = contents
+        self._saved = copy.deepcopy(contents) if exists else None
+
+    @property
+    def kind(self):
+        """Folder type, e.g. "imageset" or "appiconset" ("" for groups)."""
+        return os.path.splitext(self.path)[1].lstrip(".")
+
+    @property
+    def dirty(self):
+        return self.contents != self._saved
+
+    def mark_saved(self):
+        self._saved = copy.deepcopy(self.contents)
+
+
+def _read_entry(root, path):
+    with open(os.path.join(root, path, CONTENTS_FILE), "r") as f:
+        return CatalogEntry(path, json.load(f))
+
+
+def _new_file_mode():
+    """Mode a plain open() would give a new file under the current umask."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def _write_atomic(path, text):
+    """
+    Write a file via a temporary file and a rename so it is never half
+    written. The file keeps its existing mode; mkstemp alone would leave 0600.
+    """
+    directory = os.path.dirname(path)
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = _new_file_mode()
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".Contents.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class AssetCatalog:
+    """
+    In-memory model of an Assets.xcassets tree. Edits only touch the model;
+    flush() writes the entries that actually changed.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.entries = {}
+
+    @classmethod
+    def load(cls, root, max_workers=8, paths=None):
+        """
+        Load every Contents.json in the catalog, reading files in parallel.
+        Pass relative folder paths to load only those entries.
+        """
+        catalog = cls(root)
+        if paths is None:
+            paths = []
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames.sort()
+                if CONTENTS_FILE in filenames:
+                    paths.append(os.path.relpath(dirpath, root))
+        else:
+            paths = [path for path in paths if os.path.isfile(os.path.join(root, path, CONTENTS_FILE))]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for entry in executor.map(lambda path: _read_entry(root, path), paths):
+                catalog.entries[entry.path] = entry
+        return catalog
+
+    def folder_path(self, name, kind, group=""):
+        """Relative path of a named folder, e.g. "FlashCards/sample.imageset"."""
+        return os.path.normpath(os.path.join(group, f"{name}.{kind}"))
+
+    def absolute_path(self, path):
+        return os.path.join(self.root, path)
+
+    def get(self, path):
+        return self.entries.get(path)
+
+    def imageset_file(self, name, group=""):
+        """
+        The image file a loaded imageset's Contents.json references, or None.
+        After transcode_images.py --apply this is a .jpg or .webp, not the PNG.
+        """
+        entry = self.get(self.folder_path(name, "imageset", group))
+        filenames = [image["filename"] for image in entry.contents.get("images", []) if "filename" in image] if entry else []
+        return filenames[0] if filenames else None
+
+    def entries_of_kind(self, kind):
+        return [entry for entry in self.entries.values() if entry.kind == kind]
+
+    def _set(self, path, contents):
+        entry = self.entries.get(path)
+        if entry is None:
+            entry = CatalogEntry(path, contents, exists=False)
+            self.entries[path] = entry
+        else:
+            # Keep folder properties such as On-Demand Resources tags
+            if "properties" in entry.contents:
+                contents["properties"] = entry.contents["properties"]
+            entry.contents = contents
+        return entry
+
+    def set_imageset(self, name, filename, group=""):
+        """Point an imageset at a single universal image, creating it if needed."""
+        return self._set(self.folder_path(name, "imageset", group), imageset_contents(filename))
+
+    def set_appiconset(self, name, icon_sizes):
+        """Describe an app icon set from an ICON_SIZES style table."""
+        return self._set(self.folder_path(name, "appiconset"), appiconset_contents(icon_sizes))
+
+    def set_on_demand_tags(self, path, tags):
+        """Set (or with an empty list, clear) the On-Demand Resources tags of an entry."""
+        contents = self.entries[path].contents
+        properties = dict(contents.get("properties", {}))
+        if tags:
+            properties[ODR_TAGS_KEY] = list(tags)
+        else:
+            properties.pop(ODR_TAGS_KEY, None)
+
+        if properties:
+            contents["properties"] = properties
+        else:
+            contents.pop("properties", None)
+
+    def remove(self, path):
+        """Forget an entry. Files on disk are left for the caller to delete."""
+        self.entries.pop(path, None)
+
+    def dirty_entries(self):
+        return [entry for entry in self.entries.values() if entry.dirty]
+
+    def flush(self):
+        """Write every changed Contents.json atomically and return how many were written."""
+        dirty = self.dirty_entries()
+        for entry in dirty:
+            directory = self.absolute_path(entry.path)
+            os.makedirs(directory, exist_ok=True)
+            _write_atomic(os.path.join(directory, CONTENTS_FILE), json.dumps(entry.contents, indent=2))
+            entry.mark_saved()
+        return len(dirty)
+
+
+def update_appiconset(icon_dir, icon_sizes):
+    """
+    Regenerate an .appiconset's Contents.json from an icon size table. The
+    file is only rewritten if its contents change.
+    """
+    root, folder = os.path.split(os.path.normpath(icon_dir))
+    catalog = AssetCatalog.load(root, paths=[folder])
+    catalog.set_appiconset(os.path.splitext(folder)[0], icon_sizes)
+    return catalog.flush()
+
+
+def main():
+    if len(sys.argv) != 2:
+        print("Usage: python asset_catalog.py <assets_dir>")
+        sys.exit(1)
+
+    assets_dir = sys.argv[1]
+
+    if not os.path.isdir(assets_dir):
+        print(f"Error: {assets_dir} is not a valid directory")
+        sys.exit(1)
+
+    catalog = AssetCatalog.load(assets_dir)
+    kinds = {}
+    for entry in catalog.entries.values():
+        kind = entry.kind or "group"
+        kinds[kind] = kinds.get(kind, 0) + 1
+
+    print(f"Loaded {len(catalog.entries)} Contents.json files from {assets_dir}")
+    for kind, count in sorted(kinds.items()):
+        print(f"  {kind}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from analyze_image_memory import read_png_header, decoded_size, format_bytes
+from shards import pop_shard_arg, select_shard
+
+# Folders whose image files are recorded in the manifest
+MANIFEST_KINDS = (".imageset", ".appiconset")
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+
+# Decoded bytes per pixel for formats without a PNG header (RGBA/BGRA)
+DEFAULT_DECODED_BYTES_PER_PIXEL = 4
+
+
+def _file_digest(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _image_info(path):
+    """Return (width, height, decoded bytes) without decoding the pixels."""
+    if path.lower().endswith(".png"):
+        width, height, bit_depth, color_type = read_png_header(path)
+        return width, height, decoded_size(width, height, bit_depth, color_type)
+    with Image.open(path) as img:
+        width, height = img.size
+    return width, height, width * height * DEFAULT_DECODED_BYTES_PER_PIXEL
+
+
+def iter_asset_folders(assets_dir):
+    """Yield (relative folder path, [image file stats]) for every image folder."""
+    for root, dirs, files in os.walk(assets_dir):
+        dirs.sort()
+        if not root.endswith(MANIFEST_KINDS):
+            continue
+        stats = []
+        for filename in sorted(files):
+            if filename.lower().endswith(IMAGE_EXTENSIONS):
+                stat = os.stat(os.path.join(root, filename))
+                stats.append([filename, stat.st_size, stat.st_mtime_ns])
+        yield os.path.relpath(root, assets_dir), stats
+
+
+def build_entry(assets_dir, path, stats):
+    """
+    Manifest entry for one folder: digest over its image files, total bytes,
+    the largest image's dimensions and the summed decoded-memory estimate.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    width = height = decoded = 0
+    for filename, _, _ in stats:
+        file_path = os.path.join(assets_dir, path, filename)
+        digest.update(f"{filename}:{_file_digest(file_path)}\n".encode("utf-8"))
+        try:
+            w, h, d = _image_info(file_path)
+        except (ValueError, OSError) as e:
+            print(f"Warning: {e}")
+            continue
+        if w * h > width * height:
+            width, height = w, h
+        decoded += d
+
+    return {
+        "digest": digest.hexdigest(),
+        "bytes": sum(size for _, size, _ in stats),
+        "width": width,
+        "height": height,
+        "decoded_bytes": decoded,
+        "files": stats,
+    }
+
+
+def load_manifest(path):
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def write_manifest(manifest, path):
+    """Write one compact entry per line, sorted by folder path."""
+    lines = [f"{json.dumps(key)}:{json.dumps(manifest[key], separators=(',', ':'))}" for key in sorted(manifest)]
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write("{\n" + ",\n".join(lines) + "\n}\n" if lines else "{}\n")
+    os.replace(tmp_path, path)
+
+
+def build_manifest(assets_dir, previous=None, shard=None, max_workers=8):
+    """
+    Build the manifest for a catalog. Entries from a previous manifest are
+    reused when a folder's files have the same names, sizes and modification
+    times, so unchanged images are never read. Returns (manifest, reused count).
+    """
+    previous = previous or {}
+    folders = list(iter_asset_folders(assets_dir))
+    folders = select_shard(folders, shard, key=lambda folder: folder[0],
+                           weight=lambda folder: sum(size for _, size, _ in folder[1]))
+
+    manifest = {}
+    stale = []
+    for path, stats in folders:
+        if not stats:
+            continue
+        old = previous.get(path)
+        if old is not None and old.get("files") == stats:
+            manifest[path] = old
+        else:
+            stale.append((path, stats))
+
+    reused = len(manifest)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for (path, _), entry in zip(stale, executor.map(lambda folder: build_entry(assets_dir, *folder), stale)):
+            manifest[path] = entry
+    return manifest, reused
+
+
+def main():
+    try:
+        shard, args = pop_shard_arg(sys.argv[1:])
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if len(args) not in (2, 3):
+        print("Usage: python asset_manifest.py <assets_dir> <manifest_path> [previous_manifest] [--shard I/N]")
+        sys.exit(1)
+
+    assets_dir = args[0]
+    manifest_path = args[1]
+    # By default the manifest being replaced is the cache for this run
+    previous_path = args[2] if len(args) == 3 else manifest_path
+
+    if not os.path.isdir(assets_dir):
+        print(f"Error: {assets_dir} is not a valid directory")
+        sys.exit(1)
+
+    manifest, reused = build_manifest(assets_dir, load_manifest(previous_path), shard)
+    write_manifest(manifest, manifest_path)
+
+    total = sum(entry["bytes"] for entry in manifest.values())
+    decoded = sum(entry["decoded_bytes"] for entry in manifest.values())
+    print(f"Recorded {len(manifest)} asset folders ({reused} unchanged, {len(manifest) - reused} read)")
+    print(f"Total file size: {format_bytes(total)}, decoded memory: {format_bytes(decoded)}")
+    print(f"Wrote manifest to {manifest_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import random
+import struct
+import hashlib
+
+import numpy as np
+
+from validate_vocabulary import iter_json_object, normalize_headword
+
+# File layout (little endian):
+#   header: magic, version, level count, key count, value count, value blob size
+#   one (bit count, word offset) pair per level
+#   level bit arrays as 64-bit words, then the rank of each word
+#   one 32-bit key fingerprint and one 32-bit value id per slot
+#   value offsets (value count + 1) and the UTF-8 value blob
+MAGIC = b"WIMH"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIII")
+LEVEL = struct.Struct("<QQ")
+
+# Bits per key at each level; higher builds faster and looks up in fewer levels
+GAMMA = 2.0
+MAX_LEVELS = 32
+
+BENCHMARK_SIZES = (1000, 100000, 1000000)
+
+_MASK = (1 << 64) - 1
+
+
+def key_hashes(key):
+    """Two 64-bit hashes of a key; the mixed per-level hashes derive from these."""
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little")
+
+
+def _fingerprint(h2):
+    return h2 >> 32
+
+
+def _level_hash(h1, h2, level):
+    """splitmix64 finalizer over h1 + (level + 1) * h2, matching _level_hashes."""
+    x = (h1 + (level + 1) * h2) & _MASK
+    x ^= x >> 30
+    x = (x * 0xBF58476D1CE4E5B9) & _MASK
+    x ^= x >> 27
+    x = (x * 0x94D049BB133111EB) & _MASK
+    return x ^ (x >> 31)
+
+
+def _level_hashes(h1, h2, level):
+    """Vectorized _level_hash over uint64 arrays (multiplication wraps mod 2**64)."""
+    x = h1 + np.uint64(level + 1) * h2
+    x ^= x >> np.uint64(30)
+    x *= np.uint64(0xBF58476D1CE4E5B9)
+    x ^= x >> np.uint64(27)
+    x *= np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def build_index(mapping):
+    """
+    Build a minimal perfect hash (BBHash style) over the mapping's keys and
+    return the serialized index as bytes. Keys are hashed once; each level is
+    a bit array where keys that land alone in a slot are placed, and the rest
+    fall through to the next, smaller level.
+    """
+    keys = list(mapping)
+    count = len(keys)
+    hashes = [key_hashes(key) for key in keys]
+    h1 = np.fromiter((h[0] for h in hashes), dtype=np.uint64, count=count)
+    h2 = np.fromiter((h[1] for h in hashes), dtype=np.uint64, count=count)
+
+    values = sorted(set(mapping.values()))
+    value_ids = {value: i for i, value in enumerate(values)}
+    key_value_ids = np.fromiter((value_ids[mapping[key]] for key in keys), dtype=np.uint32, count=count)
+
+    slots = np.empty(count, dtype=np.int64)
+    remaining = np.arange(count)
+    level_bits = []
+    placed_so_far = 0
+
+    while len(remaining):
+        if len(level_bits) == MAX_LEVELS:
+            raise ValueError(f"Could not place {len(remaining)} keys in {MAX_LEVELS} levels")
+
+        size = max(64, -(-int(len(remaining) * GAMMA) // 64) * 64)
+        positions = (_level_hashes(h1[remaining], h2[remaining], len(level_bits)) % np.uint64(size)).astype(np.int64)
+        alone = np.bincount(positions, minlength=size)[positions] == 1
+
+        bits = np.zeros(size, dtype=bool)
+        bits[positions[alone]] = True
+        # A key's slot is the number of set bits before its own bit, across all levels
+        rank_in_level = np.cumsum(bits) - bits
+        slots[remaining[alone]] = placed_so_far + rank_in_level[positions[alone]]
+
+        placed_so_far += int(bits.sum())
+        level_bits.append(bits)
+        remaining = remaining[~alone]
+
+    # An empty mapping has no levels, and every lookup misses
+    all_bits = np.concatenate(level_bits) if level_bits else np.zeros(0, dtype=bool)
+    words = np.packbits(all_bits, bitorder="little").view("<u8")
+    word_counts = np.unpackbits(words.view(np.uint8)).reshape(-1, 64).sum(axis=1)
+    ranks = (np.cumsum(word_counts) - word_counts).astype("<u4")
+
+    fingerprints = np.empty(count, dtype="<u4")
+    fingerprints[slots] = (h2 >> np.uint64(32)).astype(np.uint32)
+    slot_values = np.empty(count, dtype="<u4")
+    slot_values[slots] = key_value_ids
+
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(values) + 1, dtype="<u4")
+    offsets[1:] = np.cumsum([len(value) for value in encoded])
+    blob = b"".join(encoded)
+
+    parts = [HEADER.pack(MAGIC, VERSION, len(level_bits), count, len(values), len(blob))]
+    word_offset = 0
+    for bits in level_bits:
+        parts.append(LEVEL.pack(len(bits), word_offset))
+        word_offset += len(bits) // 64
+    parts += [words.tobytes(), ranks.tobytes(), fingerprints.tobytes(), slot_values.tobytes(), offsets.tobytes(), blob]
+    return b"".join(parts)
+
+
+class WordIndex:
+    """
+    Reference reader for an index built by build_index. Loading only slices
+    the file into typed views; no dictionary is built.
+    """
+
+    def __init__(self, data):
+        if sys.byteorder != "little":
+            raise ValueError("WordIndex requires a little endian host")
+
+        magic, version, levels, self.count, value_count, blob_size = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a word index file")
+
+        view = memoryview(data)
+        offset = HEADER.size
+        self._levels = []
+        for _ in range(levels):
+            self._levels.append(LEVEL.unpack_from(data, offset))
+            offset += LEVEL.size
+
+        total_words = sum(bits for bits, _ in self._levels) // 64
+
+        def take(fmt, length, size):
+            nonlocal offset
+            part = view[offset:offset + length * size].cast(fmt)
+            offset += length * size
+            return part
+
+        self._words = take("Q", total_words, 8)
+        self._ranks = take("I", total_words, 4)
+        self._fingerprints = take("I", self.count, 4)
+        self._value_ids = take("I", self.count, 4)
+        self._value_offsets = take("I", value_count + 1, 4)
+        self._blob = view[offset:offset + blob_size]
+
+    @classmethod
+    def open(cls, path):
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    def slot(self, key):
+        """Return the slot for a normalized key, or None if it is not in the index."""
+        h1, h2 = key_hashes(key)
+        for level, (bits, word_offset) in enumerate(self._levels):
+            position = _level_hash(h1, h2, level) % bits
+            index = word_offset + (position >> 6)
+            word = self._words[index]
+            bit = position & 63
+            if (word >> bit) & 1:
+                slot = self._ranks[index] + (word & ((1 << bit) - 1)).bit_count()
+                return slot if self._fingerprints[slot] == _fingerprint(h2) else None
+        return None
+
+    def get(self, key, default=None):
+        """Look up the image filename for a normalized key."""
+        slot = self.slot(key)
+        if slot is None:
+            return default
+        value_id = self._value_ids[slot]
+        start, end = self._value_offsets[value_id], self._value_offsets[value_id + 1]
+        return bytes(self._blob[start:end]).decode("utf-8")
+
+    def __contains__(self, key):
+        return self.slot(key) is not None
+
+    def __len__(self):
+        return self.count
+
+
+def load_mapping(path):
+    """Load word_image_mapping.json with headwords normalized like the app does."""
+    return {normalize_headword(word): image for word, image in iter_json_object(path)}
+
+
+def benchmark(sizes=BENCHMARK_SIZES, lookups=100000):
+    """Print build time, file size and lookup latency for synthetic mappings."""
+    rng = random.Random(0)
+    for size in sizes:
+        mapping = {f"word{i}-{rng.getrandbits(32):08x}": f"image{i % 5000}.png" for i in range(size)}
+        keys = list(mapping)
+
+        start = time.perf_counter()
+        data = build_index(mapping)
+        build_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = WordIndex(data)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        queries = [rng.choice(keys) for _ in range(lookups)]
+        start = time.perf_counter()
+        for key in queries:
+            index.get(key)
+        hit_us = (time.perf_counter() - start) / lookups * 1e6
+
+        misses = [f"missing{i}" for i in range(lookups)]
+        start = time.perf_counter()
+        false_hits = sum(1 for key in misses if key in index)
+        miss_us = (time.perf_counter() - start) / lookups * 1e6
+
+        assert all(index.get(key) == mapping[key] for key in queries[:1000])
+        print(f"{size:>9} keys: build {build_seconds:.2f}s, {len(data) / size:.1f} bytes/key "
+              f"({len(data) / 1024:.0f} KB), load {load_ms:.2f} ms, "
+              f"hit {hit_us:.2f} µs, miss {miss_us:.2f} µs, false hits {false_hits}")
+
+
+def main():
+    if sys.argv[1:] == ["--benchmark"]:
+        benchmark()
+        return
+
+    if len(sys.argv) != 3:
+        print("Usage: python build_word_index.py <mapping_file> <output_file>")
+        print("       python build_word_index.py --benchmark")
+        sys.exit(1)
+
+    mapping_file = sys.argv[1]
+    output_file = sys.argv[2]
+
+    if not os.path.exists(mapping_file):
+        print(f"Error: {mapping_file} does not exist")
+        sys.exit(1)
+
+    mapping = load_mapping(mapping_file)
+    data = build_index(mapping)
+
+    tmp_path = output_file + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, output_file)
+
+    index = WordIndex(data)
+    missing = [word for word, image in mapping.items() if index.get(word) != image]
+    if missing:
+        print(f"❌ Index lookups failed for {len(missing)} words")
+        sys.exit(1)
+
+    print(f"Built index for {len(mapping)} words in {output_file} ({len(data)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+import os
+import sys
+import importlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from icon_engine import ICON_SIZES
+from transcode_images import ssim, psnr
+
+# Design scripts whose create_icon(size) output is compared with the goldens
+DESIGNS = {
+    "classic": "create_app_icon",
+    "modern": "create_modern_app_icon",
+    "cool": "create_cool_app_icon",
+}
+
+GOLDENS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icon_goldens")
+DEFAULT_DIFF_DIR = "icon_golden_diffs"
+
+# A render passes when every metric is within these tolerances
+MAX_CHANNEL_DELTA = 16
+MIN_PSNR = 40.0
+MIN_SSIM = 0.99
+
+
+def golden_path(design, filename):
+    return os.path.join(GOLDENS_DIR, design, filename)
+
+
+def _premultiplied(pixels):
+    """RGB premultiplied by alpha, so fully transparent pixels compare equal."""
+    pixels = pixels.astype(np.float64)
+    return pixels[..., :3] * (pixels[..., 3:] / 255)
+
+
+def compare_icons(golden, render):
+    """Max channel delta, PSNR and SSIM between two RGBA arrays."""
+    delta = np.abs(golden.astype(np.int16) - render.astype(np.int16))
+    return {
+        "max_delta": int(delta.max()),
+        "psnr": psnr(golden, render),
+        "ssim": ssim(_premultiplied(golden), _premultiplied(render)),
+    }
+
+
+def within_tolerance(metrics):
+    return (metrics["max_delta"] <= MAX_CHANNEL_DELTA
+            and metrics["psnr"] >= MIN_PSNR
+            and metrics["ssim"] >= MIN_SSIM)
+
+
+def diff_heatmap(golden, render):
+    """
+    Dimmed grayscale golden with the per-pixel max channel difference drawn
+    in red, scaled so the largest difference is fully saturated.
+    """
+    delta = np.abs(golden.astype(np.int16) - render.astype(np.int16)).max(axis=2).astype(np.float64)
+    heat = delta / max(delta.max(), 1)
+    base = _premultiplied(golden).mean(axis=2) * 0.3
+    heatmap = np.stack([base + (255 - base) * heat, base * (1 - heat), base * (1 - heat)], axis=2)
+    return Image.fromarray(np.round(heatmap).astype(np.uint8), "RGB")
+
+
+def check_icon(task):
+    """
+    Render one icon and compare it with its golden, or write the golden when
+    updating. Runs in a worker process, so it takes and returns plain data.
+    """
+    design, filename, size, update, diff_dir = task
+    render = importlib.import_module(DESIGNS[design]).create_icon(size).convert("RGBA")
+    path = golden_path(design, filename)
+    result = {"design": design, "filename": filename, "size": size}
+
+    if update:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        render.save(path)
+        result["status"] = "updated"
+        return result
+
+    if not os.path.exists(path):
+        result["status"] = "missing"
+        return result
+
+    with Image.open(path) as img:
+        golden = np.asarray(img.convert("RGBA"))
+    render = np.asarray(render)
+    if golden.shape != render.shape:
+        result["status"] = "failed"
+        result["error"] = f"size {render.shape[1]}x{render.shape[0]}, golden is {golden.shape[1]}x{golden.shape[0]}"
+        return result
+
+    result.update(compare_icons(golden, render))
+    result["status"] = "passed" if within_tolerance(result) else "failed"
+    if result["status"] == "failed":
+        os.makedirs(diff_dir, exist_ok=True)
+        heatmap_path = os.path.join(diff_dir, f"{design}_{filename}")
+        diff_heatmap(golden, render).save(heatmap_path)
+        result["heatmap"] = heatmap_path
+    return result
+
+
+def main():
+    update = "--update" in sys.argv[1:]
+    designs = [arg for arg in sys.argv[1:] if arg != "--update"]
+    unknown = [design for design in designs if design not in DESIGNS]
+    if unknown:
+        print(f"Error: unknown design {unknown[0]!r}, expected one of {', '.join(DESIGNS)}")
+        print("Usage: python check_icon_goldens.py [--update] [design ...]")
+        sys.exit(1)
+
+    tasks = [
+        (design, filename, size, update, DEFAULT_DIFF_DIR)
+        for design in designs or DESIGNS
+        for filename, size in ICON_SIZES.items()
+    ]
+    # Largest renders first so they do not end up last on a busy worker
+    tasks.sort(key=lambda task: -task[2])
+
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(check_icon, tasks))
+
+    if update:
+        print(f"Updated {len(results)} golden icons in {GOLDENS_DIR}")
+        return
+
+    failed = [r for r in results if r["status"] != "passed"]
+    for r in sorted(failed, key=lambda r: (r["design"], r["size"])):
+        name = f"{r['design']}/{r['filename']}"
+        if r["status"] == "missing":
+            print(f"❌ {name}: no golden image, run with --update to create it")
+        elif "error" in r:
+            print(f"❌ {name}: {r['error']}")
+        else:
+            print(f"❌ {name}: max delta {r['max_delta']}, PSNR {r['psnr']:.1f} dB, "
+                  f"SSIM {r['ssim']:.4f} (heatmap {r['heatmap']})")
+
+    if failed:
+        sys.exit(1)
+    worst = min(results, key=lambda r: r["ssim"])
+    print(f"✅ {len(results)} icons match their goldens (lowest SSIM {worst['ssim']:.4f}, "
+          f"{worst['design']}/{worst['filename']})")
+
+
+if __name__ == "__main__":
+    main()
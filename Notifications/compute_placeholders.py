@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from asset_catalog import AssetCatalog
+from job_journal import JobJournal, atomic_write, default_journal_path, stat_digest
+from shards import pop_shard_arg, select_shard
+from validate_vocabulary import normalize_headword
+
+DEFAULT_OUTPUT = "word_image_placeholders.json"
+
+# BlurHash components across and down; 4x3 suits the landscape card images
+BLURHASH_COMPONENTS = (4, 3)
+
+# Images are shrunk to at most this many pixels per side before any analysis
+BLURHASH_SAMPLE_SIZE = 32
+PALETTE_SAMPLE_SIZE = 64
+
+PALETTE_COLORS = 5
+KMEANS_ITERATIONS = 20
+
+_BASE83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+
+def _base83(value, length):
+    return "".join(_BASE83[(value // 83 ** (length - 1 - i)) % 83] for i in range(length))
+
+
+def _srgb_to_linear(pixels):
+    values = pixels / 255.0
+    return np.where(values <= 0.04045, values / 12.92, ((values + 0.055) / 1.055) ** 2.4)
+
+
+def _linear_to_srgb(value):
+    value = min(max(value, 0.0), 1.0)
+    if value <= 0.0031308:
+        return int(value * 12.92 * 255 + 0.5)
+    return int((1.055 * value ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def blurhash(pixels, components=BLURHASH_COMPONENTS):
+    """
+    Encode an RGB uint8 array as a BlurHash string. All cosine factors are
+    computed in one tensor contraction instead of a loop per component.
+    """
+    components_x, components_y = components
+    height, width = pixels.shape[:2]
+    linear = _srgb_to_linear(pixels.astype(np.float64))
+
+    basis_x = np.cos(np.pi * np.outer(np.arange(components_x), np.arange(width)) / width)
+    basis_y = np.cos(np.pi * np.outer(np.arange(components_y), np.arange(height)) / height)
+    factors = np.einsum("jy,ix,yxc->jic", basis_y, basis_x, linear) / (width * height)
+    factors[1:] *= 2
+    factors[0, 1:] *= 2
+
+    factors = factors.reshape(-1, 3)
+    dc, ac = factors[0], factors[1:]
+
+    result = _base83((components_x - 1) + (components_y - 1) * 9, 1)
+    if len(ac):
+        quantised_max = int(max(0, min(82, np.floor(np.abs(ac).max() * 166 - 0.5))))
+        max_value = (quantised_max + 1) / 166
+        result += _base83(quantised_max, 1)
+    else:
+        max_value = 1
+        result += _base83(0, 1)
+
+    r, g, b = (_linear_to_srgb(channel) for channel in dc)
+    result += _base83((r << 16) + (g << 8) + b, 4)
+
+    scaled = ac / max_value
+    quantised = np.clip(np.floor(np.sign(scaled) * np.abs(scaled) ** 0.5 * 9 + 9.5), 0, 18).astype(int)
+    for r, g, b in quantised:
+        result += _base83(r * 19 * 19 + g * 19 + b, 2)
+    return result
+
+
+def _nearest(points, centers):
+    """Index of the nearest center for every point, as one matrix product."""
+    distances = (centers ** 2).sum(axis=1)[None, :] - 2 * points @ centers.T
+    return distances.argmin(axis=1)
+
+
+def dominant_colors(pixels, count=PALETTE_COLORS, iterations=KMEANS_ITERATIONS):
+    """
+    Cluster the pixels with k-means and return [(hex color, share)] sorted by
+    share. Identical pixels are clustered once, weighted by how often they
+    occur, and seeded k-means++ keeps the palette identical between runs.
+    """
+    flat = pixels.reshape(-1, 3).astype(np.uint32)
+    packed, weights = np.unique((flat[:, 0] << 16) | (flat[:, 1] << 8) | flat[:, 2], return_counts=True)
+    points = np.stack([packed >> 16, (packed >> 8) & 255, packed & 255], axis=1).astype(np.float64)
+    weights = weights.astype(np.float64)
+    count = min(count, len(points))
+    rng = np.random.default_rng(0)
+
+    centers = points[[rng.choice(len(points), p=weights / weights.sum())]]
+    for _ in range(count - 1):
+        distances = ((points[:, None, :] - centers[None]) ** 2).sum(axis=2).min(axis=1) * weights
+        centers = np.vstack([centers, points[rng.choice(len(points), p=distances / distances.sum())]])
+
+    for _ in range(iterations):
+        labels = _nearest(points, centers)
+        sizes = np.bincount(labels, weights=weights, minlength=count)
+        sums = np.stack([np.bincount(labels, weights=weights * points[:, c], minlength=count) for c in range(3)], axis=1)
+        moved = np.where(sizes[:, None] > 0, sums / np.maximum(sizes, 1)[:, None], centers)
+        converged = np.allclose(moved, centers, atol=0.5)
+        centers = moved
+        if converged:
+            break
+
+    shares = np.bincount(_nearest(points, centers), weights=weights, minlength=count) / weights.sum()
+    order = np.argsort(-shares, kind="stable")
+    return [
+        ("#{:02x}{:02x}{:02x}".format(*np.round(centers[i]).astype(int)), round(float(shares[i]), 3))
+        for i in order
+        if shares[i] > 0
+    ]
+
+
+def _load_rgb(path, size):
+    """Load an image shrunk to fit size x size, flattening transparency onto white."""
+    with Image.open(path) as img:
+        img.draft("RGB", (size, size))
+        img = img.convert("RGBA")
+        img.thumbnail((size, size), Image.BOX)
+    background = Image.new("RGBA", img.size, (255, 255, 255, 255))
+    return np.asarray(Image.alpha_composite(background, img).convert("RGB"))
+
+
+def compute_placeholder(task):
+    """Compute the placeholder entry for one word. Runs in a worker process."""
+    word, path = task
+    palette_pixels = _load_rgb(path, PALETTE_SAMPLE_SIZE)
+    with Image.fromarray(palette_pixels) as img:
+        img.thumbnail((BLURHASH_SAMPLE_SIZE, BLURHASH_SAMPLE_SIZE), Image.BOX)
+        blur_pixels = np.asarray(img)
+
+    palette = dominant_colors(palette_pixels)
+    return word, {
+        "blurhash": blurhash(blur_pixels),
+        "dominant_color": palette[0][0],
+        "palette": [{"color": color, "share": share} for color, share in palette],
+    }
+
+
+def image_tasks(mapping, catalog):
+    """
+    Resolve each mapped word to the image file its imageset references, so
+    transcoded JPEG or WebP files are found too. Returns (tasks, missing words).
+    """
+    tasks = []
+    missing = []
+    for word, image_file in mapping.items():
+        name = os.path.splitext(image_file)[0]
+        filename = catalog.imageset_file(name)
+        path = os.path.join(catalog.absolute_path(catalog.folder_path(name, "imageset")), filename) if filename else None
+        if path is None or not os.path.isfile(path):
+            missing.append(word)
+            continue
+        tasks.append((word, path))
+    return tasks, missing
+
+
+def main():
+    try:
+        shard, args = pop_shard_arg(sys.argv[1:])
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if len(args) not in (1, 2):
+        print("Usage: python compute_placeholders.py <assets_dir> [output_path] [--shard I/N]")
+        sys.exit(1)
+
+    assets_dir = args[0]
+    output_path = args[1] if len(args) == 2 else DEFAULT_OUTPUT
+
+    if not os.path.isdir(assets_dir):
+        print(f"Error: {assets_dir} is not a valid directory")
+        sys.exit(1)
+
+    if not os.path.exists("word_image_mapping.json"):
+        print("Error: word_image_mapping.json does not exist. Run this script from the Notifications directory.")
+        sys.exit(1)
+
+    with open("word_image_mapping.json", "r") as f:
+        mapping = {normalize_headword(word): image for word, image in json.load(f).items()}
+
+    start = time.perf_counter()
+    paths = {AssetCatalog(assets_dir).folder_path(os.path.splitext(image)[0], "imageset") for image in mapping.values()}
+    catalog = AssetCatalog.load(assets_dir, paths=sorted(paths))
+    tasks, missing = image_tasks(mapping, catalog)
+    tasks = select_shard(tasks, shard, key=lambda task: task[0], weight=lambda task: os.path.getsize(task[1]))
+
+    # Results are journaled as they arrive, so an interrupted run resumes
+    # with only the images it had not finished
+    params = (os.path.abspath(assets_dir), os.path.abspath(output_path), shard)
+    placeholders = {}
+    with JobJournal(default_journal_path("compute_placeholders", *params), json.dumps(params)) as journal:
+        todo = []
+        for word, path in tasks:
+            digest = stat_digest(path)
+            if journal.is_done(word, digest):
+                placeholders[word] = journal.result(word)
+            else:
+                todo.append((word, path, digest))
+        if placeholders:
+            print(f"Resuming: {len(placeholders)} placeholders already computed")
+
+        with ProcessPoolExecutor() as executor:
+            results = executor.map(compute_placeholder, [(word, path) for word, path, _ in todo], chunksize=16)
+            for (word, _, digest), (_, placeholder) in zip(todo, results):
+                journal.record(word, digest, placeholder)
+                placeholders[word] = placeholder
+
+    # Sorted so merged shard outputs match a single-node run exactly
+    placeholders = dict(sorted(placeholders.items()))
+    atomic_write(output_path, json.dumps(placeholders, indent=2))
+
+    print(f"Computed placeholders for {len(todo)} words in {time.perf_counter() - start:.1f}s")
+    if missing:
+        print(f"⚠️ {len(missing)} words have no image in the catalog")
+    print(f"Wrote placeholders to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
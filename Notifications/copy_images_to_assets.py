@@ -3,59 +3,71 @@ import os
 import json
 import shutil
 import sys
+from asset_catalog import AssetCatalog
+from job_journal import JobJournal, default_journal_path, stat_digest
+from shards import pop_shard_arg, select_shard
 
-def create_image_asset(image_name, source_dir, assets_dir):
+# Contents.json files are written and the journal updated this often
+CHECKPOINT_EVERY = 500
+
+def create_image_asset(image_name, source_dir, catalog):
     """
-    Create an image asset for a single image.
+    Create an image asset for a single image. Contents.json is only updated
+    in the catalog model; call catalog.flush() to write the changes.
     """
-    # Create the imageset directory
-    imageset_dir = os.path.join(assets_dir, f"{image_name}.imageset")
+    previous_file = catalog.imageset_file(image_name)
+    
+    # Describe the imageset in the catalog
+    entry = catalog.set_imageset(image_name, f"{image_name}.png")
+    imageset_dir = catalog.absolute_path(entry.path)
     os.makedirs(imageset_dir, exist_ok=True)
     
-    # Create the Contents.json file
-    contents = {
-        "images": [
-            {
-                "idiom": "universal",
-                "filename": f"{image_name}.png",
-                "scale": "1x"
-            },
-            {
-                "idiom": "universal",
-                "scale": "2x"
-            },
-            {
-                "idiom": "universal",
-                "scale": "3x"
-            }
-        ],
-        "info": {
-            "version": 1,
-            "author": "xcode"
-        }
-    }
-    
-    with open(os.path.join(imageset_dir, "Contents.json"), "w") as f:
-        json.dump(contents, f, indent=2)
-    
-    # Copy the image file
+    # Copy the image file through a temporary file so it is never half written
     source_file = os.path.join(source_dir, f"{image_name}.png")
     dest_file = os.path.join(imageset_dir, f"{image_name}.png")
     
     if os.path.exists(source_file):
-        shutil.copy2(source_file, dest_file)
+        shutil.copy2(source_file, dest_file + ".tmp")
+        os.replace(dest_file + ".tmp", dest_file)
+        # A transcoded copy of the old source is stale now; rerun
+        # transcode_images.py to transcode the new one
+        if previous_file and previous_file != f"{image_name}.png":
+            stale_file = os.path.join(imageset_dir, previous_file)
+            if os.path.exists(stale_file):
+                os.remove(stale_file)
         return True
     else:
         print(f"Warning: Source file {source_file} does not exist")
         return False
 
+def _copied_from(dest_file, source_file):
+    """
+    True if dest_file still holds a copy of source_file rather than a file
+    another run wrote. shutil.copy2 and transcode_images.py --apply both keep
+    the source's modification time, so the times match exactly.
+    """
+    try:
+        return dest_file is not None and os.stat(dest_file).st_mtime_ns == os.stat(source_file).st_mtime_ns
+    except OSError:
+        return False
+
+def _source_size(source_dir, image_file):
+    path = os.path.join(source_dir, image_file)
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
 def main():
-    if len(sys.argv) != 3:
-        print("Usage: python copy_images_to_assets.py <source_images_dir> <assets_dir>")
+    try:
+        shard, args = pop_shard_arg(sys.argv[1:])
+    except ValueError as e:
+        print(f"Error: {e}")
         sys.exit(1)
     
-    source_dir = sys.argv[1]
-    assets_dir = sys.argv[2]
+    if len(args) != 2:
+        print("Usage: python copy_images_to_assets.py <source_images_dir> <assets_dir> [--shard I/N]")
+        sys.exit(1)
+    
+    source_dir = args[0]
+    assets_dir = args[1]
     
     if not os.path.isdir(source_dir):
         print(f"Error: {source_dir} is not a valid directory")
@@ -84,17 +96,67 @@ def main():
         if first_image:
             shutil.copy2(os.path.join(source_dir, first_image), default_source)
     
-    # Create the default image asset
-    create_image_asset("default", source_dir, assets_dir)
+    # Split the words across shards by image file, balanced by file size
+    items = select_shard(list(mapping.items()), shard, key=lambda item: item[1],
+                         weight=lambda item: _source_size(source_dir, item[1]))
+    
+    # The default image is created once, by the first shard
+    image_names = ["default"] if shard is None or shard[0] == 1 else []
+    image_names += [os.path.splitext(image_file)[0] for word, image_file in items]
+    image_names = list(dict.fromkeys(image_names))
+    
+    # Load the Contents.json files this run may change
+    catalog = AssetCatalog.load(assets_dir, paths=[f"{image_name}.imageset" for image_name in image_names])
     
-    # Create image assets for each word
-    success_count = 0
-    for word, image_file in mapping.items():
-        image_name = os.path.splitext(image_file)[0]
-        if create_image_asset(image_name, source_dir, assets_dir):
-            success_count += 1
+    # Skip images a previous, interrupted run already finished. The check
+    # follows Contents.json, so imagesets transcode_images.py moved to JPEG
+    # or WebP still count as copied while their source PNG is unchanged
+    params = (os.path.abspath(source_dir), os.path.abspath(assets_dir), shard)
+    journal = JobJournal(default_journal_path("copy_images_to_assets", *params), json.dumps(params))
+    todo = []
+    for image_name in image_names:
+        source_file = os.path.join(source_dir, f"{image_name}.png")
+        digest = stat_digest(source_file)
+        dest_name = catalog.imageset_file(image_name)
+        dest_file = os.path.join(assets_dir, f"{image_name}.imageset", dest_name) if dest_name else None
+        if not (journal.is_done(image_name, digest) and _copied_from(dest_file, source_file)):
+            todo.append((image_name, digest))
+    if journal.resumed:
+        print(f"Resuming: {len(image_names) - len(todo)} images already copied")
     
-    print(f"Successfully copied {success_count} of {len(mapping)} images to assets catalog")
+    # Create image assets, checkpointing every CHECKPOINT_EVERY images: the
+    # Contents.json files are written first, then the journal records them
+    written = 0
+    copied = []
+    failed = set()
+    with journal:
+        for i, (image_name, digest) in enumerate(todo, start=1):
+            if create_image_asset(image_name, source_dir, catalog):
+                copied.append((image_name, digest))
+            else:
+                failed.add(image_name)
+            if i % CHECKPOINT_EVERY == 0 or i == len(todo):
+                written += catalog.flush()
+                for unit in copied:
+                    journal.record(*unit)
+                copied = []
+    
+    success_count = sum(1 for word, image_file in items if os.path.splitext(image_file)[0] not in failed)
+    print(f"Updated {written} Contents.json files")
+    print(f"Successfully copied {success_count} of {len(items)} images to assets catalog")
+    
+    # Record image dimensions so lookups never have to open the images. The
+    # metadata step needs NumPy and Pillow, which copying itself does not
+    if shard is None:
+        try:
+            from image_metadata import DEFAULT_OUTPUT as METADATA_FILE, write_metadata
+        except ImportError as e:
+            print(f"⚠️ Skipped image metadata ({e}); run image_metadata.py once it is installed")
+        else:
+            usable = write_metadata(mapping, assets_dir, METADATA_FILE)
+            print(f"Wrote image metadata for {usable} words to {METADATA_FILE}")
+    else:
+        print("Run image_metadata.py once every shard has finished to write the image metadata")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+import os
+import sys
+
+from asset_manifest import load_manifest
+from analyze_image_memory import format_bytes
+
+# Budgets and the flags that set them; all values are in bytes
+BUDGET_FLAGS = {
+    "--max-total-growth": "total_growth",
+    "--max-asset-bytes": "asset_bytes",
+    "--max-decoded-bytes": "decoded_bytes",
+}
+
+# How many grown assets to list
+MAX_LISTED = 20
+
+
+def diff_manifests(old, new):
+    """
+    Compare two manifests in one pass over each. Returns a dict with added,
+    removed, grown, shrunk and changed folder paths plus total deltas.
+    """
+    diff = {"added": [], "removed": [], "grown": [], "shrunk": [], "changed": []}
+    for path, entry in new.items():
+        before = old.get(path)
+        if before is None:
+            diff["added"].append(path)
+        elif entry["bytes"] > before["bytes"] or entry["decoded_bytes"] > before["decoded_bytes"]:
+            diff["grown"].append(path)
+        elif entry["bytes"] < before["bytes"]:
+            diff["shrunk"].append(path)
+        elif entry["digest"] != before["digest"]:
+            diff["changed"].append(path)
+    diff["removed"] = [path for path in old if path not in new]
+
+    for key in ("bytes", "decoded_bytes"):
+        diff[key] = (sum(entry[key] for entry in old.values()), sum(entry[key] for entry in new.values()))
+    return diff
+
+
+def check_budgets(diff, new, budgets):
+    """Return a list of budget violation messages."""
+    violations = []
+    growth = diff["bytes"][1] - diff["bytes"][0]
+    if "total_growth" in budgets and growth > budgets["total_growth"]:
+        violations.append(f"Total size grew by {format_bytes(growth)} (budget {format_bytes(budgets['total_growth'])})")
+
+    for path in diff["added"] + diff["grown"]:
+        entry = new[path]
+        if "asset_bytes" in budgets and entry["bytes"] > budgets["asset_bytes"]:
+            violations.append(f"{path} is {format_bytes(entry['bytes'])} (budget {format_bytes(budgets['asset_bytes'])})")
+        if "decoded_bytes" in budgets and entry["decoded_bytes"] > budgets["decoded_bytes"]:
+            violations.append(f"{path} decodes to {format_bytes(entry['decoded_bytes'])} "
+                              f"(budget {format_bytes(budgets['decoded_bytes'])})")
+    return violations
+
+
+def _delta(before, after):
+    sign = "+" if after >= before else "-"
+    return f"{format_bytes(before)} -> {format_bytes(after)} ({sign}{format_bytes(abs(after - before))})"
+
+
+def main():
+    args = []
+    budgets = {}
+    argv = iter(sys.argv[1:])
+    for arg in argv:
+        flag, _, value = arg.partition("=")
+        if flag in BUDGET_FLAGS:
+            value = value or next(argv, "")
+            if not value.isdigit():
+                print(f"Error: {flag} expects a number of bytes")
+                sys.exit(1)
+            budgets[BUDGET_FLAGS[flag]] = int(value)
+        else:
+            args.append(arg)
+
+    if len(args) != 2:
+        print("Usage: python diff_asset_manifests.py <old_manifest> <new_manifest> "
+              "[--max-total-growth BYTES] [--max-asset-bytes BYTES] [--max-decoded-bytes BYTES]")
+        sys.exit(1)
+
+    for path in args:
+        if not os.path.isfile(path):
+            print(f"Error: {path} does not exist")
+            sys.exit(1)
+
+    old = load_manifest(args[0])
+    new = load_manifest(args[1])
+    diff = diff_manifests(old, new)
+
+    print(f"Added: {len(diff['added'])}, removed: {len(diff['removed'])}, grown: {len(diff['grown'])}, "
+          f"shrunk: {len(diff['shrunk'])}, changed: {len(diff['changed'])}")
+    print(f"Total file size: {_delta(*diff['bytes'])}")
+    print(f"Total decoded memory: {_delta(*diff['decoded_bytes'])}")
+
+    grown = sorted(diff["added"] + diff["grown"], key=lambda path: new[path]["bytes"] - old.get(path, {}).get("bytes", 0),
+                   reverse=True)
+    for path in grown[:MAX_LISTED]:
+        before = old.get(path, {}).get("bytes", 0)
+        print(f"  {'+' if path not in old else '↑'} {path}: {_delta(before, new[path]['bytes'])}")
+
+    violations = check_budgets(diff, new, budgets)
+    for violation in violations:
+        print(f"❌ {violation}")
+    if violations:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
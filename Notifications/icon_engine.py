@@ -0,0 +1,555 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import pickle
+import hashlib
+from PIL import Image, ImageDraw, ImageFont, ImageFilter
+
+from job_journal import JobJournal, default_journal_path, value_digest
+from shards import pop_shard_arg, select_shard
+
+# Define icon sizes needed for iOS
+ICON_SIZES = {
+    # iPhone
+    "iphone_20pt@2x.png": 40,
+    "iphone_20pt@3x.png": 60,
+    "iphone_29pt@2x.png": 58,
+    "iphone_29pt@3x.png": 87,
+    "iphone_40pt@2x.png": 80,
+    "iphone_40pt@3x.png": 120,
+    "iphone_60pt@2x.png": 120,
+    "iphone_60pt@3x.png": 180,
+
+    # iPad
+    "ipad_20pt@1x.png": 20,
+    "ipad_20pt@2x.png": 40,
+    "ipad_29pt@1x.png": 29,
+    "ipad_29pt@2x.png": 58,
+    "ipad_40pt@1x.png": 40,
+    "ipad_40pt@2x.png": 80,
+    "ipad_76pt@1x.png": 76,
+    "ipad_76pt@2x.png": 152,
+    "ipad_83.5pt@2x.png": 167,
+
+    # App Store
+    "ios-marketing_1024pt@1x.png": 1024
+}
+
+SPECS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icon_specs")
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".icon_cache")
+
+# Bump this whenever a layer renderer changes its output so stale cache
+# entries are not reused
+ENGINE_VERSION = 2
+
+# Peak memory of a single render must stay below this many full-size RGBA
+# frames (size * size * 4 bytes each)
+MEMORY_BOUND_FRAMES = 4
+
+# A layer renders to a list of "stamps": (source, box, mask) tuples that are
+# replayed onto the icon with Image.paste. The source is either an image or a
+# fill color. Pasting through a mask reproduces exactly what the original
+# ImageDraw calls did to the pixels underneath, so layers can be rendered and
+# cached independently and still composite to the same result.
+#
+# Stamps are kept small so large renders stay cheap: a shape is stored as a
+# fill color plus a one byte per pixel mask cropped to the shape, and solid
+# rectangles need no mask at all.
+
+
+class _ScratchCanvas:
+    """
+    Full-size buffers shared by every layer in a render. Shapes are drawn
+    here, cropped out into stamps and the touched region is cleared again,
+    so layers never allocate a full-size canvas of their own.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.mask = Image.new('L', (size, size), 0)
+        self.mask_draw = ImageDraw.Draw(self.mask)
+        self._image = None
+        self._image_draw = None
+
+    def take_mask(self, box=None):
+        """Crop the mask (all of it by default) and clear the cropped region."""
+        if box is None:
+            box = self.mask.getbbox()
+            if box is None:
+                return None, None
+        mask = self.mask.crop(box)
+        self.mask.paste(0, box)
+        return mask, box
+
+    def shape_stamp(self, shape, xy, color, outline=False, **kwargs):
+        """
+        Rasterize a single shape into a stamp, or None if it covers nothing.
+        With outline=True only the shape's outline is drawn instead of its fill.
+        """
+        kwargs["outline" if outline else "fill"] = 255
+        getattr(self.mask_draw, shape)(xy, **kwargs)
+        mask, box = self.take_mask()
+        if mask is None:
+            return None
+        if mask.getextrema() == (255, 255):
+            return (color, box, None)
+        return (color, box[:2], mask)
+
+    def draw(self, shape, xy, **kwargs):
+        """
+        Draw a shape onto the shared RGBA buffer. Used for layers made of many
+        thin shapes that are cheaper to keep as a single stamp.
+        """
+        if self._image is None:
+            self._image = Image.new('RGBA', (self.size, self.size), (0, 0, 0, 0))
+            self._image_draw = ImageDraw.Draw(self._image)
+        getattr(self._image_draw, shape)(xy, **kwargs)
+        mask_kwargs = {
+            key: 255 if key in ("fill", "outline") and value is not None else value
+            for key, value in kwargs.items()
+        }
+        getattr(self.mask_draw, shape)(xy, **mask_kwargs)
+
+    def take_drawn(self):
+        """Crop everything drawn since the last call into a single stamp."""
+        mask, box = self.take_mask()
+        if mask is None:
+            return []
+        image = self._image.crop(box)
+        self._image.paste((0, 0, 0, 0), box)
+        return [(image, box[:2], mask)]
+
+
+def _lerp_color(start, end, progress, formula="mix"):
+    """
+    Interpolate between two colors. The "offset" formula matches the
+    start + progress * delta arithmetic used by the original W icon; the two
+    formulas round differently, so each spec says which one it uses.
+    """
+    if formula == "offset":
+        return tuple(int(a + progress * (b - a)) for a, b in zip(start, end))
+    return tuple(int(a * (1 - progress) + b * progress) for a, b in zip(start, end))
+
+
+def _card_geometry(size, layer):
+    """Return the margin and size shared by the card based layers."""
+    card_margin = size // layer["margin_div"]
+    card_size = size - (2 * card_margin)
+    return card_margin, card_size
+
+
+def render_gradient(size, layer, canvas):
+    """Vertical gradient filling the whole icon."""
+    # Every row is one solid color, so runs of equal rows become box fills
+    stamps = []
+    run_start = 0
+    run_color = None
+    for y in range(size):
+        color = _lerp_color(layer["top"], layer["bottom"], y / size, layer.get("formula", "mix")) + (255,)
+        if color != run_color:
+            if run_color is not None:
+                stamps.append((run_color, (0, run_start, size, y), None))
+            run_start = y
+            run_color = color
+    if run_color is not None:
+        stamps.append((run_color, (0, run_start, size, size), None))
+    return stamps
+
+
+def render_round_clip(size, layer, canvas):
+    """Clear everything outside a rounded rectangle."""
+    radius = size // layer["radius_div"]
+    canvas.mask.paste(255, (0, 0, size, size))
+    canvas.mask_draw.rounded_rectangle([(0, 0), (size, size)], radius=radius, fill=0)
+
+    # Only the corners lie outside the rectangle, so crop those rather than
+    # keeping a full-size mask; anything left over is picked up afterwards
+    corner = min(size, radius + 2)
+    boxes = [
+        (0, 0, corner, corner),
+        (size - corner, 0, size, corner),
+        (0, size - corner, corner, size),
+        (size - corner, size - corner, size, size),
+    ]
+    stamps = []
+    for box in boxes + [None]:
+        mask, box = canvas.take_mask(box)
+        if mask is not None and mask.getbbox() is not None:
+            stamps.append(((0, 0, 0, 0), box[:2], mask))
+    return stamps
+
+
+def render_stripes(size, layer, canvas):
+    """Horizontal lines whose opacity increases towards the bottom."""
+    if "step" in layer:
+        step = layer["step"]
+    else:
+        step = max(layer.get("min_step", 1), size // layer["step_div"])
+    base_opacity, opacity_range = layer["opacity"]
+    color = tuple(layer.get("color", (255, 255, 255)))
+
+    stamps = []
+    for i in range(0, size, step):
+        opacity = int(base_opacity + (i / size) * opacity_range)
+        stamps.append(canvas.shape_stamp("line", [(0, i), (size, i)], color + (opacity,), width=layer.get("width", 1)))
+    return stamps
+
+
+def render_stacked_cards(size, layer, canvas):
+    """Square cards stacked with increasing offsets towards the bottom right."""
+    card_margin, card_size = _card_geometry(size, layer)
+    radius = size // layer["radius_div"]
+    color = tuple(layer.get("color", (255, 255, 255)))
+
+    stamps = []
+    for card in layer["cards"]:
+        offset = size // card["offset_div"] if "offset_div" in card else 0
+        start = card_margin + offset
+        end = start + card_size - offset
+        stamps.append(canvas.shape_stamp("rounded_rectangle", [(start, start), (end, end)], color + (card["alpha"],), radius=radius))
+    return stamps
+
+
+def render_v_glyph(size, layer, canvas):
+    """A stylized "V" with a dot above it."""
+    card_margin, card_size = _card_geometry(size, layer)
+    color = tuple(layer["color"])
+    v_width = int(card_size * layer["scale"])
+    v_height = int(card_size * layer["scale"])
+    v_thickness = max(layer.get("min_width", 2), size // layer["width_div"])
+
+    center_x = card_margin + card_size // 2
+    center_y = card_margin + card_size // 2
+    points = [
+        (center_x - v_width // 2, center_y - v_height // 2),  # Top left
+        (center_x, center_y + v_height // 2),                 # Bottom center
+        (center_x + v_width // 2, center_y - v_height // 2)   # Top right
+    ]
+
+    dot_radius = max(layer.get("min_dot", 2), size // layer["dot_div"])
+    dot_y_offset = v_height // 4
+    return [
+        canvas.shape_stamp("line", [points[0], points[1]], color, width=v_thickness),
+        canvas.shape_stamp("line", [points[1], points[2]], color, width=v_thickness),
+        canvas.shape_stamp(
+            "ellipse",
+            [(center_x - dot_radius, center_y - v_height // 2 - dot_radius - dot_y_offset),
+             (center_x + dot_radius, center_y - v_height // 2 + dot_radius - dot_y_offset)],
+            color
+        ),
+    ]
+
+
+def render_brain_glyph(size, layer, canvas):
+    """A simplified brain outline made of two hemispheres and folds."""
+    card_margin, card_size = _card_geometry(size, layer)
+    color = tuple(layer["color"])
+    half_size = int(card_size * layer["scale"]) // 2
+    line_width = max(layer.get("min_width", 2), size // layer["width_div"])
+
+    center_x = card_margin + card_size // 2
+    center_y = card_margin + card_size // 2
+    left_x = center_x - half_size // 3
+    right_x = center_x + half_size // 3
+
+    stamps = []
+    for x in (left_x, right_x):
+        stamps.append(canvas.shape_stamp(
+            "arc",
+            [(x - half_size, center_y - half_size), (x + half_size, center_y + half_size)],
+            color, start=180, end=0, width=line_width
+        ))
+
+    # Connect the hemispheres at the top
+    stamps.append(canvas.shape_stamp(
+        "line",
+        [(left_x, center_y - half_size), (right_x, center_y - half_size)],
+        color, width=line_width
+    ))
+
+    fold_length = half_size // 2
+    for x in (left_x, right_x):
+        for i in range(3):
+            y_offset = -half_size // 2 + i * (half_size // 2)
+            stamps.append(canvas.shape_stamp(
+                "arc",
+                [(x - fold_length, center_y + y_offset - fold_length // 2),
+                 (x + fold_length, center_y + y_offset + fold_length // 2)],
+                color, start=180, end=0, width=line_width
+            ))
+    return stamps
+
+
+def render_shine(size, layer, canvas):
+    """Diagonal highlight fading out from the top left corner."""
+    shine_width = size // layer["width_div"]
+    max_opacity = layer.get("opacity", 200)
+
+    # Hundreds of thin diagonals with different opacities: draw them all on
+    # the shared buffer and keep one stamp instead of one mask per line
+    for i in range(shine_width):
+        opacity = int(max_opacity * (1 - i / shine_width))
+        if i < size:
+            canvas.draw("line", [(i, 0), (0, i)], fill=(255, 255, 255, opacity), width=1)
+    return canvas.take_drawn()
+
+
+def render_drop_shadow(size, layer, canvas):
+    """A rounded shadow offset below the icon."""
+    # Pasting a shadow image through its own alpha is the same as pasting
+    # its color through a mask holding that alpha, which is 4x smaller
+    color = tuple(layer["color"])
+    canvas.mask_draw.rounded_rectangle(
+        [(0, 0), (size, size)],
+        radius=size // layer["radius_div"],
+        fill=color[3]
+    )
+    mask, box = canvas.take_mask()
+    if mask is None:
+        return []
+    return [(color, (box[0], box[1] + size // layer["offset_div"]), mask)]
+
+
+def render_card(size, layer, canvas):
+    """A single card with a blurred shadow, sized by an aspect ratio."""
+    card_margin, card_width = _card_geometry(size, layer)
+    card_height = int(card_width * layer["aspect"])
+    stamps = []
+
+    if "shadow" in layer:
+        spec = layer["shadow"]
+        shadow = Image.new('RGBA', (card_width, card_height), (0, 0, 0, spec["alpha"]))
+        shadow = shadow.filter(ImageFilter.GaussianBlur(radius=size // spec["blur_div"]))
+        stamps.append((shadow, (card_margin + size // spec["dx_div"], card_margin + size // spec["dy_div"]), shadow))
+
+    stamps.append(canvas.shape_stamp(
+        "rounded_rectangle",
+        [(card_margin, card_margin), (card_margin + card_width, card_margin + card_height)],
+        tuple(layer["color"]),
+        radius=size // layer["radius_div"]
+    ))
+    return stamps
+
+
+def render_letter(size, layer, canvas):
+    """Text centered on the card, drawn with a vertical color gradient."""
+    card_margin, card_width = _card_geometry(size, layer)
+    card_height = int(card_width * layer["aspect"])
+    text = layer["text"]
+
+    # Fonts shipped in icon_specs/fonts/ are found relative to the specs, so
+    # every machine renders the same glyphs; other names are system fonts
+    font_path = os.path.join(SPECS_DIR, layer["font"])
+    try:
+        font_size = size // layer["size_div"]
+        font = ImageFont.truetype(font_path if os.path.exists(font_path) else layer["font"], font_size)
+    except IOError:
+        font_size = size // layer["fallback_size_div"]
+        font = ImageFont.load_default()
+
+    bbox = font.getbbox(text)
+    text_width = bbox[2] - bbox[0]
+    text_height = bbox[3] - bbox[1]
+    x = card_margin + (card_width - text_width) // 2
+    y = card_margin + (card_height - text_height) // 2
+
+    # The gradient is drawn by stamping the same glyph once per row offset,
+    # so rasterize it once on a buffer just big enough to hold it
+    pad = 2
+    glyph = Image.new('L', (bbox[2] - bbox[0] + 2 * pad, bbox[3] - bbox[1] + 2 * pad), 0)
+    ImageDraw.Draw(glyph).text((pad - bbox[0], pad - bbox[1]), text, font=font, fill=255)
+    glyph_box = glyph.getbbox()
+    if glyph_box is None:
+        return []
+    glyph = glyph.crop(glyph_box)
+    glyph_x = x + bbox[0] - pad + glyph_box[0]
+    glyph_y = y + bbox[1] - pad + glyph_box[1]
+
+    stamps = []
+    for i in range(font_size):
+        color = _lerp_color(layer["top"], layer["bottom"], i / font_size, layer.get("formula", "mix"))
+        stamps.append((color + (255,), (glyph_x, glyph_y + i), glyph))
+    return stamps
+
+
+def render_flash_cards(size, layer, canvas):
+    """Small rotated cards fanned out along the bottom edge."""
+    card_size = size // layer["size_div"]
+    card_margin = size // layer["margin_div"]
+    stamps = []
+    for angle in layer["angles"]:
+        card = Image.new('RGBA', (card_size, card_size), tuple(layer["color"]))
+        card = card.rotate(angle, expand=True)
+        x_offset = size // 2 - card.width // 2
+        y_offset = size - card.height - card_margin // 2
+        stamps.append((card, (x_offset, y_offset), card))
+    return stamps
+
+
+def render_border(size, layer, canvas):
+    """A rounded outline around the whole icon."""
+    return [canvas.shape_stamp(
+        "rounded_rectangle",
+        [(0, 0), (size - 1, size - 1)],
+        tuple(layer["color"]),
+        radius=size // layer["radius_div"],
+        outline=True,
+        width=max(1, size // layer["width_div"])
+    )]
+
+
+LAYER_TYPES = {
+    "gradient": render_gradient,
+    "round_clip": render_round_clip,
+    "stripes": render_stripes,
+    "stacked_cards": render_stacked_cards,
+    "v_glyph": render_v_glyph,
+    "brain_glyph": render_brain_glyph,
+    "shine": render_shine,
+    "drop_shadow": render_drop_shadow,
+    "card": render_card,
+    "letter": render_letter,
+    "flash_cards": render_flash_cards,
+    "border": render_border,
+}
+
+
+class LayerCache:
+    """
+    Cache of rendered layer stamps keyed by layer parameters and icon size.
+    Entries are kept in memory and, when a directory is given, pickled to
+    disk so later runs only re-render the layers that changed.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._memory = {}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def get(self, key):
+        stamps = self._memory.get(key)
+        if stamps is None and self.cache_dir:
+            path = os.path.join(self.cache_dir, f"{key}.pkl")
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    stamps = pickle.load(f)
+                self._memory[key] = stamps
+        if stamps is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return stamps
+
+    def put(self, key, stamps):
+        self._memory[key] = stamps
+        if self.cache_dir:
+            path = os.path.join(self.cache_dir, f"{key}.pkl")
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(stamps, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+
+
+def layer_key(layer, size):
+    """Stable cache key for a layer rendered at a given size."""
+    params = {key: value for key, value in layer.items() if key != "name"}
+    payload = json.dumps([ENGINE_VERSION, size, params], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _layer_stamps(layer, size, cache, canvas):
+    key = layer_key(layer, size)
+    stamps = cache.get(key)
+    if stamps is None:
+        if layer["type"] == "group":
+            # A group is composited on its own transparent canvas and then
+            # pasted through its alpha, so its children are cached separately
+            image = composite_layers(layer["layers"], size, cache, canvas)
+            stamps = [(image, (0, 0), image)]
+        elif layer["type"] in LAYER_TYPES:
+            stamps = LAYER_TYPES[layer["type"]](size, layer, canvas)
+            stamps = [stamp for stamp in stamps if stamp is not None]
+        else:
+            raise ValueError(f"Unknown layer type: {layer['type']}")
+        cache.put(key, stamps)
+    return stamps
+
+
+def composite_layers(layers, size, cache, canvas=None):
+    """Composite a list of layers, bottom first, onto a transparent image."""
+    if canvas is None:
+        canvas = _ScratchCanvas(size)
+    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    for layer in layers:
+        for source, box, mask in _layer_stamps(layer, size, cache, canvas):
+            img.paste(source, box, mask)
+    return img
+
+
+def load_spec(path):
+    """Load an icon spec from a JSON or TOML file."""
+    if path.endswith(".toml"):
+        import tomllib
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def render_icon(spec, size, cache=None):
+    """Render an icon spec at the given size."""
+    if cache is None:
+        cache = LayerCache()
+    return composite_layers(spec["layers"], size, cache)
+
+
+def main():
+    try:
+        shard, args = pop_shard_arg(sys.argv[1:])
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if len(args) not in (2, 3):
+        print("Usage: python icon_engine.py <spec_file> <output_dir> [cache_dir] [--shard I/N]")
+        sys.exit(1)
+
+    spec_path = args[0]
+    output_dir = args[1]
+    cache_dir = args[2] if len(args) == 3 else DEFAULT_CACHE_DIR
+
+    if not os.path.isfile(spec_path):
+        print(f"Error: {spec_path} does not exist")
+        sys.exit(1)
+
+    spec = load_spec(spec_path)
+    cache = LayerCache(cache_dir)
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Render cost grows with pixel count, so balance shards by area
+    icons = select_shard(list(ICON_SIZES.items()), shard, key=lambda icon: icon[0], weight=lambda icon: icon[1] ** 2)
+    # Sizes finished by an interrupted run with the same spec are not rendered again
+    params = (os.path.abspath(spec_path), os.path.abspath(output_dir), shard)
+    with JobJournal(default_journal_path("icon_engine", *params), json.dumps(params)) as journal:
+        for filename, size in icons:
+            path = os.path.join(output_dir, filename)
+            digest = value_digest(ENGINE_VERSION, spec, size)
+            if journal.is_done(filename, digest, output=path):
+                print(f"Skipping {filename} ({size}x{size}), already rendered")
+                continue
+
+            print(f"Generating {filename} ({size}x{size})...")
+            icon = render_icon(spec, size, cache)
+            icon.save(path + ".tmp", "PNG")
+            os.replace(path + ".tmp", path)
+            journal.record(filename, digest, output=path)
+
+    print(f"Rendered {spec.get('name', spec_path)} ({cache.hits} cached layers, {cache.misses} rendered)")
+
+
+if __name__ == "__main__":
+    main()
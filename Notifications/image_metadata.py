@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import struct
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from analyze_image_memory import COLOR_TYPE_NAMES, read_png_header
+from asset_catalog import AssetCatalog
+from build_word_index import WordIndex, build_index
+from validate_vocabulary import normalize_headword
+
+DEFAULT_OUTPUT = "word_image_metadata.bin"
+
+# File layout (little endian):
+#   header: magic, version, reserved, word count, size of the embedded index
+#   the word index from build_word_index.py, padded to 8 bytes
+#   per slot of that index: width u32, height u32, file bytes u32,
+#   16-byte blake2b digest, pixel mode u8 (index into MODE_NAMES)
+MAGIC = b"WIMM"
+VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+DIGEST_SIZE = 16
+
+# Mode 0 means the image file is missing or unreadable
+MODE_NAMES = ("none", "L", "RGB", "P", "LA", "RGBA", "CMYK", "I", "F")
+
+
+def _pad8(size):
+    return -size % 8
+
+
+def _digest(path):
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def read_image_metadata(path):
+    """
+    Return (width, height, mode, bytes, digest) for an image file, reading
+    only the PNG IHDR header (or PIL's lazy header parse for other formats).
+    Missing or unreadable files come back with mode "none".
+    """
+    try:
+        if path.lower().endswith(".png"):
+            width, height, _, color_type = read_png_header(path)
+            mode = COLOR_TYPE_NAMES.get(color_type, "none")
+        else:
+            with Image.open(path) as img:
+                (width, height), mode = img.size, img.mode
+        return width, height, mode, os.path.getsize(path), _digest(path)
+    except (OSError, ValueError):
+        return 0, 0, "none", 0, bytes(DIGEST_SIZE)
+
+
+def build_metadata(image_paths, max_workers=8):
+    """
+    Serialize metadata for {normalized word: image path}. The arrays are
+    ordered by the slots of an embedded word index, so a lookup is one hash
+    and a few array reads.
+    """
+    words = list(image_paths)
+    index_data = build_index({word: os.path.basename(image_paths[word]) for word in words})
+    index = WordIndex(index_data)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        metadata = list(executor.map(read_image_metadata, (image_paths[word] for word in words)))
+
+    count = len(words)
+    widths = [0] * count
+    heights = [0] * count
+    sizes = [0] * count
+    digests = [bytes(DIGEST_SIZE)] * count
+    modes = bytearray(count)
+    for word, (width, height, mode, size, digest) in zip(words, metadata):
+        slot = index.slot(word)
+        widths[slot], heights[slot], sizes[slot], digests[slot] = width, height, size, digest
+        modes[slot] = MODE_NAMES.index(mode) if mode in MODE_NAMES else 0
+
+    return b"".join([
+        HEADER.pack(MAGIC, VERSION, 0, count, len(index_data)),
+        index_data,
+        bytes(_pad8(len(index_data))),
+        struct.pack(f"<{count}I", *widths),
+        struct.pack(f"<{count}I", *heights),
+        struct.pack(f"<{count}I", *sizes),
+        b"".join(digests),
+        bytes(modes),
+    ])
+
+
+class ImageMetadata:
+    """Reference reader for files written by build_metadata; nothing is decoded on load."""
+
+    def __init__(self, data):
+        magic, version, _, self.count, index_size = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not an image metadata file")
+
+        view = memoryview(data)
+        offset = HEADER.size
+        self.index = WordIndex(view[offset:offset + index_size])
+        offset += index_size + _pad8(index_size)
+
+        arrays = []
+        for _ in range(3):
+            arrays.append(view[offset:offset + 4 * self.count].cast("I"))
+            offset += 4 * self.count
+        self._widths, self._heights, self._sizes = arrays
+        self._digests = view[offset:offset + DIGEST_SIZE * self.count]
+        offset += DIGEST_SIZE * self.count
+        self._modes = view[offset:offset + self.count]
+
+    @classmethod
+    def open(cls, path):
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    def get(self, word):
+        """Metadata for a word (normalized like WordImageManager does), or None."""
+        slot = self.index.slot(normalize_headword(word))
+        if slot is None:
+            return None
+        return {
+            "image": self.index.get(normalize_headword(word)),
+            "width": self._widths[slot],
+            "height": self._heights[slot],
+            "mode": MODE_NAMES[self._modes[slot]],
+            "bytes": self._sizes[slot],
+            "digest": self._digests[slot * DIGEST_SIZE:(slot + 1) * DIGEST_SIZE].hex(),
+        }
+
+    def has_usable_image(self, word):
+        """True if the word maps to an image file that exists and has pixels."""
+        slot = self.index.slot(normalize_headword(word))
+        return slot is not None and self._modes[slot] != 0 and self._widths[slot] > 0 and self._heights[slot] > 0
+
+    def aspect_ratio(self, word):
+        """Width / height of the word's image, or None without a usable image."""
+        if not self.has_usable_image(word):
+            return None
+        slot = self.index.slot(normalize_headword(word))
+        return self._widths[slot] / self._heights[slot]
+
+
+def mapped_image_paths(mapping, assets_dir):
+    """
+    Where each mapped word's image lives in the catalog, keyed by normalized
+    word. Paths follow each imageset's Contents.json, so images transcoded
+    to JPEG or WebP are found; words without an imageset get the path their
+    PNG would have and come out with mode "none".
+    """
+    catalog = AssetCatalog(assets_dir)
+    paths = {catalog.folder_path(os.path.splitext(image_file)[0], "imageset") for image_file in mapping.values()}
+    catalog = AssetCatalog.load(assets_dir, paths=sorted(paths))
+
+    paths = {}
+    for word, image_file in mapping.items():
+        name = os.path.splitext(image_file)[0]
+        filename = catalog.imageset_file(name) or image_file
+        paths[normalize_headword(word)] = os.path.join(catalog.absolute_path(catalog.folder_path(name, "imageset")), filename)
+    return paths
+
+
+def write_metadata(mapping, assets_dir, output_path):
+    """Build and atomically write the metadata file. Returns the number of usable images."""
+    data = build_metadata(mapped_image_paths(mapping, assets_dir))
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, output_path)
+
+    metadata = ImageMetadata(data)
+    return sum(1 for word in mapping if metadata.has_usable_image(word))
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python image_metadata.py <assets_dir> [output_path]")
+        sys.exit(1)
+
+    assets_dir = sys.argv[1]
+    output_path = sys.argv[2] if len(sys.argv) == 3 else DEFAULT_OUTPUT
+
+    if not os.path.isdir(assets_dir):
+        print(f"Error: {assets_dir} is not a valid directory")
+        sys.exit(1)
+
+    if not os.path.exists("word_image_mapping.json"):
+        print("Error: word_image_mapping.json does not exist. Run this script from the Notifications directory.")
+        sys.exit(1)
+
+    with open("word_image_mapping.json", "r") as f:
+        mapping = json.load(f)
+
+    usable = write_metadata(mapping, assets_dir, output_path)
+    print(f"Wrote metadata for {len(mapping)} words to {output_path} ({os.path.getsize(output_path)} bytes)")
+    print(f"{usable} words have a usable image")
+
+
+if __name__ == "__main__":
+    main()
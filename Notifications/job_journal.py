@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+import os
+import json
+import hashlib
+
+# Journals live here unless a script is given another path
+JOURNAL_DIR = ".journals"
+
+
+def stat_digest(path):
+    """
+    Cheap input digest from a file's name, size and modification time. Used
+    for large inputs where hashing every file on resume would be too slow.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return "missing"
+    key = f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def value_digest(*values):
+    """Digest of JSON-serializable values, e.g. a spec and an icon size."""
+    data = json.dumps(values, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def atomic_write(path, data):
+    """Write bytes or text to a temporary file and rename it over path."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb" if isinstance(data, bytes) else "w") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def default_journal_path(job, *params):
+    """Journal path for a job, distinct for each set of parameters (e.g. directories)."""
+    key = value_digest(*params)
+    return os.path.join(JOURNAL_DIR, f"{job}-{key}.log")
+
+
+class JobJournal:
+    """
+    Append-only record of completed work units. Each line holds a unit name,
+    the digest of its inputs, optionally a digest of the file it wrote, and
+    an optional JSON result. A unit counts as done only while its input
+    digest is unchanged and its output file is the one it wrote, so edited
+    inputs are redone and outputs another run overwrote are rewritten. A
+    line cut short by a crash is ignored on the next load.
+    """
+
+    def __init__(self, path, job_key):
+        self.path = path
+        self._done = {}
+        header = json.dumps({"job": job_key})
+
+        text = ""
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+        # Only lines followed by a newline were written completely
+        lines = text.split("\n")[:-1]
+
+        if lines and lines[0] == header:
+            for line in lines[1:]:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                self._done[record["unit"]] = (record["digest"], record.get("result"), record.get("output"))
+            self._file = open(path, "a", encoding="utf-8")
+            if not text.endswith("\n"):
+                self._file.write("\n")
+        else:
+            # A different job (or no journal) starts from scratch
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._file = open(path, "w", encoding="utf-8")
+            self._file.write(header + "\n")
+            self._file.flush()
+        self.resumed = len(self._done)
+
+    def is_done(self, unit, digest, output=None):
+        """True if the unit was recorded with this digest and its output, if given, is unchanged."""
+        record = self._done.get(unit)
+        if record is None or record[0] != digest:
+            return False
+        return output is None or record[2] == stat_digest(output)
+
+    def result(self, unit):
+        record = self._done.get(unit)
+        return record[1] if record else None
+
+    def record(self, unit, digest, result=None, output=None):
+        """
+        Mark a unit as completed. Call only once its output is safely written;
+        pass the output path to have is_done check it was not replaced since.
+        """
+        entry = {"unit": unit, "digest": digest}
+        if result is not None:
+            entry["result"] = result
+        output_digest = stat_digest(output) if output is not None else None
+        if output_digest is not None:
+            entry["output"] = output_digest
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._file.flush()
+        self._done[unit] = (digest, result, output_digest)
+
+    def close(self):
+        if self._file:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
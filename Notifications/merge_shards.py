@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+
+# Fields that identify an entry in a list-style report, in order of preference
+ENTRY_KEYS = ("path", "name", "word")
+
+
+def _entry_key(entry):
+    for field in ENTRY_KEYS:
+        if isinstance(entry, dict) and field in entry:
+            return str(entry[field])
+    raise ValueError(f"Report entry has none of the fields {', '.join(ENTRY_KEYS)}")
+
+
+def merge_objects(parts):
+    """
+    Merge JSON objects keyed by word or filename. A key may appear in more
+    than one shard only with the same value. Keys come out sorted, which is
+    the order the sharded scripts also use for single-node output.
+    """
+    merged = {}
+    for part in parts:
+        for key, value in part.items():
+            if key in merged and merged[key] != value:
+                raise ValueError(f"Shards disagree about {key!r}")
+            merged[key] = value
+    return dict(sorted(merged.items()))
+
+
+def merge_lists(parts):
+    """Concatenate list-style reports, sorted by each entry's path or name."""
+    merged = {}
+    for part in parts:
+        for entry in part:
+            key = _entry_key(entry)
+            if key in merged and merged[key] != entry:
+                raise ValueError(f"Shards disagree about {key!r}")
+            merged[key] = entry
+    return [merged[key] for key in sorted(merged)]
+
+
+def merge_shard_outputs(paths):
+    """Load the JSON output of every shard and merge them into one result."""
+    parts = []
+    for path in paths:
+        with open(path, "r") as f:
+            parts.append(json.load(f))
+
+    if all(isinstance(part, dict) for part in parts):
+        return merge_objects(parts)
+    if all(isinstance(part, list) for part in parts):
+        return merge_lists(parts)
+    raise ValueError("Shard outputs must all be JSON objects or all be JSON arrays")
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage: python merge_shards.py <output_path> <shard_output> [<shard_output> ...]")
+        sys.exit(1)
+
+    output_path = sys.argv[1]
+    shard_paths = sys.argv[2:]
+
+    for path in shard_paths:
+        if not os.path.isfile(path):
+            print(f"Error: {path} does not exist")
+            sys.exit(1)
+
+    try:
+        merged = merge_shard_outputs(shard_paths)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(merged, f, indent=2)
+    os.replace(tmp_path, output_path)
+
+    print(f"Merged {len(shard_paths)} shard outputs ({len(merged)} entries) into {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+from asset_catalog import AssetCatalog
+from validate_vocabulary import normalize_headword
+
+# Must match groupSize in WordGroupService.createWordGroups (WordGroups.swift)
+GROUP_SIZE = 15
+
+# Default maximum size of a single download tag (8 MB)
+DEFAULT_TAG_BUDGET = 8 * 1024 * 1024
+
+
+def load_word_groups(words_file):
+    """
+    Rebuild the word groups the app creates: words.json in order, split into
+    consecutive groups of GROUP_SIZE words. Group ids start at 1.
+    """
+    with open(words_file, "r") as f:
+        words = [entry["word"] for entry in json.load(f)]
+    return [words[i:i + GROUP_SIZE] for i in range(0, len(words), GROUP_SIZE)]
+
+
+def imageset_bytes(catalog, path):
+    """Total size of the image files inside an imageset folder."""
+    directory = catalog.absolute_path(path)
+    return sum(
+        os.path.getsize(os.path.join(directory, filename))
+        for filename in os.listdir(directory)
+        if filename != "Contents.json"
+    )
+
+
+def plan_tags(groups, mapping, catalog, budget=DEFAULT_TAG_BUDGET):
+    """
+    Partition the imagesets used by the word groups into download tags.
+    Consecutive groups are packed into a tag until the next group would push
+    it over budget; a group is never split across tags. Each image belongs to
+    the first group that uses it.
+    """
+    tags = []
+    assigned = set()
+    current = None
+
+    for group_id, words in enumerate(groups, start=1):
+        images = []
+        for word in words:
+            image_file = mapping.get(normalize_headword(word))
+            if not image_file:
+                continue
+            path = catalog.folder_path(os.path.splitext(image_file)[0], "imageset")
+            if path in assigned or catalog.get(path) is None:
+                continue
+            assigned.add(path)
+            images.append(path)
+
+        if not images:
+            continue
+
+        size = sum(imageset_bytes(catalog, path) for path in images)
+        if current is None or current["bytes"] + size > budget:
+            current = {"first_group": group_id, "last_group": group_id, "imagesets": [], "bytes": 0}
+            tags.append(current)
+
+        current["last_group"] = group_id
+        current["imagesets"].extend(images)
+        current["bytes"] += size
+
+    for tag in tags:
+        tag["tag"] = f"word-groups-{tag['first_group']:03d}-{tag['last_group']:03d}"
+    return tags
+
+
+def apply_tags(catalog, tags):
+    """Write the tag assignments into the imagesets and clear stale tags."""
+    tag_for_path = {path: tag["tag"] for tag in tags for path in tag["imagesets"]}
+    for entry in catalog.entries_of_kind("imageset"):
+        tag = tag_for_path.get(entry.path)
+        catalog.set_on_demand_tags(entry.path, [tag] if tag else [])
+    return catalog.flush()
+
+
+def build_manifest(tags, catalog, budget):
+    """Manifest listing tags in prefetch order (the order groups are studied)."""
+    tagged = {path for tag in tags for path in tag["imagesets"]}
+    untagged = [entry.path for entry in catalog.entries_of_kind("imageset") if entry.path not in tagged]
+    return {
+        "budget_bytes": budget,
+        # The first tag covers the first daily group, so ship it with the app
+        "initial_install_tags": [tags[0]["tag"]] if tags else [],
+        "prefetch_order": [tag["tag"] for tag in tags],
+        "tags": [
+            {
+                "tag": tag["tag"],
+                "groups": [tag["first_group"], tag["last_group"]],
+                "imagesets": len(tag["imagesets"]),
+                "bytes": tag["bytes"],
+            }
+            for tag in tags
+        ],
+        "untagged_imagesets": sorted(untagged),
+        "untagged_bytes": sum(imageset_bytes(catalog, path) for path in untagged),
+    }
+
+
+def main():
+    if len(sys.argv) not in (3, 4):
+        print("Usage: python plan_odr_tags.py <assets_dir> <manifest_path> [budget_bytes]")
+        sys.exit(1)
+
+    assets_dir = sys.argv[1]
+    manifest_path = sys.argv[2]
+    budget = int(sys.argv[3]) if len(sys.argv) == 4 else DEFAULT_TAG_BUDGET
+
+    if not os.path.isdir(assets_dir):
+        print(f"Error: {assets_dir} is not a valid directory")
+        sys.exit(1)
+
+    for required in ("words.json", "word_image_mapping.json"):
+        if not os.path.exists(required):
+            print(f"Error: {required} does not exist. Run this script from the Notifications directory.")
+            sys.exit(1)
+
+    with open("word_image_mapping.json", "r") as f:
+        mapping = {normalize_headword(word): image for word, image in json.load(f).items()}
+
+    groups = load_word_groups("words.json")
+    catalog = AssetCatalog.load(assets_dir)
+    tags = plan_tags(groups, mapping, catalog, budget)
+    written = apply_tags(catalog, tags)
+
+    manifest = build_manifest(tags, catalog, budget)
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    print(f"Planned {len(tags)} tags for {len(groups)} word groups (budget {budget} bytes)")
+    print(f"Updated {written} Contents.json files")
+    print(f"{len(manifest['untagged_imagesets'])} imagesets stay in the main bundle ({manifest['untagged_bytes']} bytes)")
+    print(f"Wrote manifest to {manifest_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import resource
+from icon_engine import MEMORY_BOUND_FRAMES, LayerCache, load_spec, render_icon
+
+def peak_memory():
+    """Return the peak resident memory of this process in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def render_marketing_icon(spec_path, size, output_path):
+    """
+    Render an icon spec at an arbitrary size (e.g. 4096px for print) and
+    return the elapsed time and the peak memory used by the render.
+    """
+    spec = load_spec(spec_path)
+    baseline = peak_memory()
+    start = time.perf_counter()
+
+    # No disk cache: large layers are not worth persisting between runs
+    icon = render_icon(spec, size, LayerCache())
+    icon.save(output_path)
+
+    elapsed = time.perf_counter() - start
+    return elapsed, peak_memory() - baseline
+
+def main():
+    if len(sys.argv) != 4:
+        print("Usage: python render_marketing_icon.py <spec_file> <size> <output_path>")
+        sys.exit(1)
+
+    spec_path = sys.argv[1]
+    size = int(sys.argv[2])
+    output_path = sys.argv[3]
+
+    if not os.path.isfile(spec_path):
+        print(f"Error: {spec_path} does not exist")
+        sys.exit(1)
+
+    elapsed, used = render_marketing_icon(spec_path, size, output_path)
+    bound = MEMORY_BOUND_FRAMES * size * size * 4
+
+    print(f"Rendered {output_path} ({size}x{size}) in {elapsed:.2f}s")
+    print(f"Peak memory: {used / (1024 * 1024):.1f} MB (bound {bound / (1024 * 1024):.1f} MB)")
+
+    if used > bound:
+        print("❌ Peak memory exceeded the bound!")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+import heapq
+import hashlib
+
+SHARD_FLAG = "--shard"
+
+
+def parse_shard(value):
+    """Parse "I/N" (1-based, e.g. "2/8") into (index, count)."""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard {value!r}, expected I/N such as 1/4")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard {value!r}, I must be between 1 and N")
+    return index, count
+
+
+def pop_shard_arg(args):
+    """
+    Remove "--shard I/N" or "--shard=I/N" from a list of command line
+    arguments. Returns (shard or None, remaining arguments).
+    """
+    shard = None
+    remaining = []
+    args = iter(args)
+    for arg in args:
+        if arg == SHARD_FLAG:
+            shard = parse_shard(next(args, ""))
+        elif arg.startswith(SHARD_FLAG + "="):
+            shard = parse_shard(arg[len(SHARD_FLAG) + 1:])
+        else:
+            remaining.append(arg)
+    return shard, remaining
+
+
+def stable_hash(key):
+    """Hash that is the same on every machine and run, unlike hash()."""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def assign_shards(items, count, key, weight):
+    """
+    Assign every item to one of count shards so each shard gets about the same
+    total weight. Heaviest items are placed first, each on the lightest shard;
+    ties are broken by the stable hash of the key, so every node computes the
+    same assignment from the same input. Returns a list of shard indexes
+    (0-based), one per item.
+    """
+    order = sorted(range(len(items)), key=lambda i: (-weight(items[i]), stable_hash(key(items[i])), key(items[i])))
+    loads = [(0, shard) for shard in range(count)]
+    assignment = [0] * len(items)
+    for i in order:
+        load, shard = heapq.heappop(loads)
+        assignment[i] = shard
+        heapq.heappush(loads, (load + weight(items[i]), shard))
+    return assignment
+
+
+def select_shard(items, shard, key, weight=lambda item: 1):
+    """
+    Return the items that belong to shard (index, count) from parse_shard, in
+    their original order. With shard None every item is returned.
+    """
+    if shard is None:
+        return list(items)
+    index, count = shard
+    assignment = assign_shards(items, count, key, weight)
+    return [item for item, assigned in zip(items, assignment) if assigned == index - 1]
+
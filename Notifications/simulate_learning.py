@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from plan_odr_tags import GROUP_SIZE, load_word_groups
+from validate_vocabulary import iter_json_array, normalize_headword
+
+WORDS_FILE = "words.json"
+# NotificationManager cycles through the concise word list in file order
+NOTIFICATION_WORDS_FILE = "short_words.json"
+
+DEFAULT_OPTIONS = {
+    "learners": 10000,
+    "days": 180,
+    # Minutes between notifications, as entered in the notification settings
+    "interval_minutes": 60,
+    # "cycle" is what the app does today; "due" notifies the words closest to being forgotten
+    "policy": "cycle",
+    "seed": 0,
+    "report": None,
+}
+POLICIES = ("cycle", "due")
+
+# Learners are simulated in independent chunks to bound memory
+CHUNK_LEARNERS = 5000
+
+# Memory model: recall after t days is 2 ** (-t / stability)
+INITIAL_STABILITY = 1.0
+# Reviewing a word multiplies its stability by 1 + growth * ability * (1 - recall),
+# so reviews just before a word is forgotten help the most
+STUDY_GROWTH = 3.0
+NOTIFICATION_GROWTH = 0.8
+# A failed flash card review keeps this share of the word's stability
+LAPSE_FACTOR = 0.5
+# Seeing a word for the first time in a notification only half introduces it
+NOTIFICATION_INTRO = 0.5
+
+# A learner marks a word as learned (heart button) once it is this stable,
+# and "Unlearned Only" mode then stops showing it in flash cards
+LEARNED_STABILITY = 14.0
+# Share of the daily group a learner must recall before marking it completed
+GROUP_PASS_RATE = 0.8
+
+# Words with at least this recall count as retained
+RETAINED_RECALL = 0.9
+# Retention is measured on these days and on the last day
+RETENTION_EVERY = 7
+
+# Each cell stores the day it was last seen as int16 to keep the state
+# small, which caps how many days one run can simulate
+LAST_SEEN_DTYPE = np.int16
+MAX_DAYS = int(np.iinfo(LAST_SEEN_DTYPE).max) + 1
+
+
+def load_vocabulary(vocab_dir):
+    """
+    Return (words, groups, notification order): the headwords from
+    words.json, the app's 15-word groups as arrays of word indexes padded
+    with -1, and the word indexes the notifications cycle through.
+    """
+    words = [normalize_headword(entry["word"]) for entry in iter_json_array(os.path.join(vocab_dir, WORDS_FILE))]
+    index = {word: i for i, word in enumerate(words)}
+
+    groups = np.full((0, GROUP_SIZE), -1, dtype=np.int32)
+    rows = [[index[normalize_headword(word)] for word in group] for group in load_word_groups(os.path.join(vocab_dir, WORDS_FILE))]
+    if rows:
+        groups = np.array([row + [-1] * (GROUP_SIZE - len(row)) for row in rows], dtype=np.int32)
+
+    notification_path = os.path.join(vocab_dir, NOTIFICATION_WORDS_FILE)
+    if not os.path.exists(notification_path):
+        notification_path = os.path.join(vocab_dir, WORDS_FILE)
+    order = [index.get(normalize_headword(entry["word"]), -1) for entry in iter_json_array(notification_path)]
+    return words, groups, np.array(order, dtype=np.int32)
+
+
+def _recall(stability, last_seen, day):
+    """Recall probability for every cell; words never seen have recall 0."""
+    elapsed = (day - last_seen).astype(np.float32)
+    return np.where(last_seen >= 0, np.exp2(-elapsed / stability), np.float32(0))
+
+
+def _review(state, flat, day, growth, ability, success=None, intro_stability=INITIAL_STABILITY):
+    """
+    Apply reviews to the flat cell indexes in flat (with per-review learner
+    ability). Words seen for the first time are introduced; success=None
+    means the meaning was shown, so there is nothing to fail.
+    """
+    stability = state["stability"][flat]
+    last_seen = state["last_seen"][flat]
+    seen = last_seen >= 0
+    recall = np.where(seen, np.exp2(-(day - last_seen).astype(np.float32) / stability), np.float32(0))
+
+    grown = stability * (1 + growth * ability * (1 - recall))
+    if success is not None:
+        grown = np.where(success, grown, np.maximum(INITIAL_STABILITY, stability * LAPSE_FACTOR))
+    state["stability"][flat] = np.where(seen, grown, np.float32(intro_stability)).astype(np.float32)
+    state["last_seen"][flat] = day
+    return seen
+
+
+def simulate_chunk(task):
+    """
+    Simulate one chunk of learners over every day. Runs in a worker process
+    and returns per-day sums, so chunks can be added up in any order.
+    """
+    chunk, learners, word_count, groups, order, options = task
+    days = options["days"]
+    rng = np.random.default_rng([options["seed"], chunk])
+    per_day = max(1, round(24 * 60 / options["interval_minutes"]))
+    group_count = len(groups)
+
+    # Flat (learner * word_count + word) cell arrays keep every update a single fancy index
+    state = {
+        "stability": np.full(learners * word_count, INITIAL_STABILITY, dtype=np.float32),
+        "last_seen": np.full(learners * word_count, -1, dtype=LAST_SEEN_DTYPE),
+        "learned": np.zeros(learners * word_count, dtype=bool),
+    }
+    engagement = rng.beta(4, 2, learners).astype(np.float32)
+    open_rate = rng.beta(2, 3, learners).astype(np.float32)
+    ability = rng.lognormal(0, 0.2, learners).astype(np.float32)
+    current_group = np.zeros(learners, dtype=np.int32)
+    cursor = np.zeros(learners, dtype=np.int64)
+    base = np.arange(learners, dtype=np.int64)[:, None] * word_count
+
+    totals = {
+        "active": np.zeros(days, dtype=np.int64),
+        "study_reviews": np.zeros((days, GROUP_SIZE + 1), dtype=np.int64),
+        "notifications_opened": np.zeros(days, dtype=np.int64),
+        "groups_completed": np.zeros(days, dtype=np.int64),
+        "words_learned": np.zeros(days, dtype=np.int64),
+    }
+    retention_days = sorted(set(range(RETENTION_EVERY - 1, days, RETENTION_EVERY)) | {days - 1})
+    retention = {key: np.zeros(len(retention_days)) for key in ("seen", "recall_seen", "retained")}
+
+    for day in range(days):
+        # Flash card study of the daily group (first incomplete group)
+        active = (rng.random(learners) < engagement) & (current_group < group_count)
+        group_words = groups[np.minimum(current_group, group_count - 1)]
+        studied = active[:, None] & (group_words >= 0)
+        cells = base + np.maximum(group_words, 0)
+        already_learned = studied & state["learned"][cells]
+        studied &= ~already_learned
+
+        flat = cells[studied]
+        recall = _recall(state["stability"][flat], state["last_seen"][flat], day)
+        success = rng.random(len(flat)) < recall
+        seen = _review(state, flat, day, STUDY_GROWTH, np.broadcast_to(ability[:, None], cells.shape)[studied], success)
+        newly_learned = success & (state["stability"][flat] >= LEARNED_STABILITY)
+        state["learned"][flat[newly_learned]] = True
+
+        passed = np.zeros(cells.shape, dtype=bool)
+        passed[studied] = success & seen
+        group_sizes = (group_words >= 0).sum(axis=1)
+        completed = active & ((passed | already_learned).sum(axis=1) >= np.ceil(GROUP_PASS_RATE * group_sizes))
+        current_group += completed
+
+        reviews = studied.sum(axis=1)
+        totals["active"][day] = active.sum()
+        totals["study_reviews"][day] = np.bincount(reviews[active], minlength=GROUP_SIZE + 1)
+        totals["groups_completed"][day] = completed.sum()
+        totals["words_learned"][day] = newly_learned.sum()
+
+        # Notifications arrive whether or not the learner studies today
+        if options["policy"] == "cycle":
+            positions = (cursor[:, None] + np.arange(per_day)) % len(order)
+            cursor += per_day
+            notified = order[positions]
+        else:
+            recall_all = _recall(state["stability"], state["last_seen"], day).reshape(learners, word_count)
+            # Unseen words sort after every seen word
+            recall_all[state["last_seen"].reshape(learners, word_count) < 0] = 2
+            notified = np.argpartition(recall_all, per_day - 1, axis=1)[:, :per_day].astype(np.int32)
+
+        opened = (rng.random(notified.shape) < open_rate[:, None]) & (notified >= 0)
+        flat = (base + np.maximum(notified, 0))[opened]
+        _review(state, flat, day, NOTIFICATION_GROWTH, np.broadcast_to(ability[:, None], notified.shape)[opened],
+                intro_stability=INITIAL_STABILITY * NOTIFICATION_INTRO)
+        totals["notifications_opened"][day] = opened.sum()
+
+        if day in retention_days:
+            i = retention_days.index(day)
+            recall_all = _recall(state["stability"], state["last_seen"], day)
+            seen_cells = state["last_seen"] >= 0
+            retention["seen"][i] = seen_cells.sum()
+            retention["recall_seen"][i] = recall_all[seen_cells].sum(dtype=np.float64)
+            retention["retained"][i] = (recall_all >= RETAINED_RECALL).sum()
+
+    totals.update(retention)
+    totals["groups_done"] = np.bincount(current_group, minlength=group_count + 1)
+    totals["notifications_sent"] = learners * per_day * days
+    return totals
+
+
+def simulate(vocab_dir, options):
+    """Simulate options["learners"] learners in parallel chunks and add up the results."""
+    words, groups, order = load_vocabulary(vocab_dir)
+    tasks = []
+    for chunk, start in enumerate(range(0, options["learners"], CHUNK_LEARNERS)):
+        learners = min(CHUNK_LEARNERS, options["learners"] - start)
+        tasks.append((chunk, learners, len(words), groups, order, options))
+
+    results = None
+    with ProcessPoolExecutor() as executor:
+        for totals in executor.map(simulate_chunk, tasks):
+            results = totals if results is None else {key: results[key] + totals[key] for key in results}
+    return words, groups, results
+
+
+def summarize(words, groups, results, options):
+    """Turn summed chunk results into the report printed and written to JSON."""
+    learners = options["learners"]
+    days = options["days"]
+    retention_days = sorted(set(range(RETENTION_EVERY - 1, days, RETENTION_EVERY)) | {days - 1})
+
+    histogram = results["study_reviews"]
+    cumulative = histogram.cumsum(axis=1)
+    active = np.maximum(results["active"], 1)
+
+    def percentile(q):
+        return [int(np.searchsorted(row, q * row[-1])) if row[-1] else 0 for row in cumulative]
+
+    return {
+        "options": options,
+        "words": len(words),
+        "groups": len(groups),
+        "retention": [
+            {
+                "day": day + 1,
+                "words_seen": float(results["seen"][i] / learners),
+                "mean_recall_seen": float(results["recall_seen"][i] / max(results["seen"][i], 1)),
+                "words_retained": float(results["retained"][i] / learners),
+            }
+            for i, day in enumerate(retention_days)
+        ],
+        "notifications": {
+            "sent": int(results["notifications_sent"]),
+            "opened": int(results["notifications_opened"].sum()),
+            "per_learner_per_day": results["notifications_sent"] / learners / days,
+        },
+        "daily": {
+            "active_learners": results["active"].tolist(),
+            "mean_study_reviews": ((histogram * np.arange(GROUP_SIZE + 1)).sum(axis=1) / active).tolist(),
+            "p95_study_reviews": percentile(0.95),
+            "notifications_opened": results["notifications_opened"].tolist(),
+            "groups_completed": results["groups_completed"].tolist(),
+            "words_learned": results["words_learned"].tolist(),
+        },
+        "groups_done_histogram": results["groups_done"].tolist(),
+    }
+
+
+def parse_options(args):
+    """Parse --name value pairs over DEFAULT_OPTIONS."""
+    options = dict(DEFAULT_OPTIONS)
+    args = iter(args)
+    for arg in args:
+        name, _, value = arg.partition("=")
+        key = name[2:].replace("-", "_")
+        if not name.startswith("--") or key not in options:
+            raise ValueError(f"Unknown option {arg}")
+        value = value or next(args, "")
+        default = DEFAULT_OPTIONS[key]
+        options[key] = int(value) if isinstance(default, int) else value
+    if options["policy"] not in POLICIES:
+        raise ValueError(f"--policy must be one of {', '.join(POLICIES)}")
+    if options["learners"] < 1 or options["days"] < 1 or options["interval_minutes"] < 1:
+        raise ValueError("--learners, --days and --interval-minutes must be positive")
+    if options["days"] > MAX_DAYS:
+        raise ValueError(f"--days must be at most {MAX_DAYS}")
+    return options
+
+
+def main():
+    try:
+        options = parse_options(sys.argv[1:])
+    except ValueError as e:
+        print(f"Error: {e}")
+        print("Usage: python simulate_learning.py [--learners N] [--days N] [--interval-minutes N] "
+              "[--policy cycle|due] [--seed N] [--report path]")
+        sys.exit(1)
+
+    if not os.path.exists(WORDS_FILE):
+        print(f"Error: {WORDS_FILE} does not exist. Run this script from the Notifications directory.")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    words, groups, results = simulate(".", options)
+    report = summarize(words, groups, results, options)
+    elapsed = time.perf_counter() - start
+
+    print(f"Simulated {options['learners']} learners x {len(words)} words x {options['days']} days "
+          f"in {elapsed:.1f}s (policy {options['policy']}, one notification every {options['interval_minutes']} min)")
+    print(f"{'day':>5} {'seen':>7} {'recall':>7} {'retained':>9}")
+    for row in report["retention"]:
+        print(f"{row['day']:>5} {row['words_seen']:>7.1f} {row['mean_recall_seen']:>7.3f} {row['words_retained']:>9.1f}")
+
+    daily = report["daily"]
+    notifications = report["notifications"]
+    print(f"Notifications: {notifications['sent']} sent, {notifications['opened']} opened "
+          f"({notifications['per_learner_per_day']:.0f} per learner per day)")
+    print(f"Study load: {np.mean(daily['mean_study_reviews']):.1f} flash cards per active learner per day, "
+          f"p95 peak {max(daily['p95_study_reviews'])}")
+    groups_done = np.array(report["groups_done_histogram"])
+    print(f"Groups completed per learner: mean {(groups_done * np.arange(len(groups_done))).sum() / options['learners']:.1f} "
+          f"of {len(groups)}, {groups_done[-1]} learners finished every group")
+
+    if options["report"]:
+        with open(options["report"], "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote report to {options['report']}")
+
+
+if __name__ == "__main__":
+    main()
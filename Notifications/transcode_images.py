@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+import io
+import math
+import os
+import sys
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from analyze_image_memory import iter_imageset_pngs
+from asset_catalog import AssetCatalog
+from shards import pop_shard_arg, select_shard
+
+# Lossy results must be at least this similar to the original
+DEFAULT_TARGET_SSIM = 0.985
+
+# Quality range searched for lossy encoders
+MIN_QUALITY = 40
+MAX_QUALITY = 95
+
+# A lossy file must be at least this much smaller than the PNG to be worth it
+MIN_SAVING = 0.10
+
+# Photographic images have many distinct colors and few flat runs
+PHOTO_UNIQUE_COLOR_RATIO = 0.1
+PHOTO_MAX_FLAT_RATIO = 0.4
+
+# Window size used by ssim()
+SSIM_WINDOW = 7
+
+
+def classify_image(pixels):
+    """
+    Classify an RGB array as "photo" or "graphic". Photos have a large share
+    of distinct colors and few horizontally repeated pixels.
+    """
+    step = max(1, max(pixels.shape[:2]) // 128)
+    sample = pixels[::step, ::step].astype(np.uint32)
+    packed = (sample[..., 0] << 16) | (sample[..., 1] << 8) | sample[..., 2]
+    unique_ratio = len(np.unique(packed)) / packed.size
+
+    flat_ratio = np.mean(np.all(pixels[:, 1:] == pixels[:, :-1], axis=2)) if pixels.shape[1] > 1 else 1.0
+
+    if unique_ratio >= PHOTO_UNIQUE_COLOR_RATIO and flat_ratio < PHOTO_MAX_FLAT_RATIO:
+        return "photo"
+    return "graphic"
+
+
+def _luminance(pixels):
+    pixels = pixels.astype(np.float64)
+    if pixels.ndim == 2:
+        return pixels
+    return pixels[..., 0] * 0.299 + pixels[..., 1] * 0.587 + pixels[..., 2] * 0.114
+
+
+def _box_mean(values, size):
+    """Mean over every size x size window, using a summed-area table."""
+    table = np.pad(values, ((1, 0), (1, 0))).cumsum(axis=0).cumsum(axis=1)
+    sums = table[size:, size:] - table[:-size, size:] - table[size:, :-size] + table[:-size, :-size]
+    return sums / (size * size)
+
+
+def ssim(a, b, window=SSIM_WINDOW):
+    """Mean structural similarity of two images' luminance (1.0 means identical)."""
+    a = _luminance(a)
+    b = _luminance(b)
+    window = min(window, *a.shape)
+
+    c1 = (0.01 * 255) ** 2
+    c2 = (0.03 * 255) ** 2
+    mu_a = _box_mean(a, window)
+    mu_b = _box_mean(b, window)
+    var_a = _box_mean(a * a, window) - mu_a * mu_a
+    var_b = _box_mean(b * b, window) - mu_b * mu_b
+    covariance = _box_mean(a * b, window) - mu_a * mu_b
+
+    score = ((2 * mu_a * mu_b + c1) * (2 * covariance + c2)) / ((mu_a ** 2 + mu_b ** 2 + c1) * (var_a + var_b + c2))
+    return float(score.mean())
+
+
+def psnr(a, b):
+    """Peak signal-to-noise ratio in dB (infinity for identical images)."""
+    mse = np.mean((a.astype(np.float64) - b.astype(np.float64)) ** 2)
+    if mse == 0:
+        return float("inf")
+    return float(10 * np.log10(255 ** 2 / mse))
+
+
+def _finite(value):
+    """JSON has no infinity, so the report stores a lossless PSNR as null."""
+    return value if math.isfinite(value) else None
+
+
+def _encode(image, fmt, quality):
+    buffer = io.BytesIO()
+    if fmt == "WEBP":
+        image.save(buffer, fmt, quality=quality, method=6)
+    else:
+        image.save(buffer, fmt, quality=quality, optimize=True, progressive=False)
+    return buffer.getvalue()
+
+
+def _decode(data):
+    with Image.open(io.BytesIO(data)) as img:
+        return np.asarray(img.convert("RGB"))
+
+
+def search_quality(image, reference, fmt, target_ssim):
+    """
+    Binary search the lowest encoder quality whose output still meets the
+    SSIM target. Returns (quality, data, score) or None if even the highest
+    quality misses the target.
+    """
+    best = None
+    low, high = MIN_QUALITY, MAX_QUALITY
+    while low <= high:
+        quality = (low + high) // 2
+        data = _encode(image, fmt, quality)
+        score = ssim(reference, _decode(data))
+        if score >= target_ssim:
+            best = (quality, data, score)
+            high = quality - 1
+        else:
+            low = quality + 1
+    return best
+
+
+def decode_time(data, repeats=3):
+    """Best of a few decode timings, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        with Image.open(io.BytesIO(data)) as img:
+            img.load()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def transcode_image(task):
+    """
+    Pick the smallest acceptable encoding for one image. Runs in a worker
+    process, so it takes and returns plain data.
+    """
+    name, path, formats, target_ssim = task
+    with open(path, "rb") as f:
+        original = f.read()
+
+    with Image.open(io.BytesIO(original)) as img:
+        has_alpha = img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info
+        if has_alpha:
+            has_alpha = img.convert("RGBA").getextrema()[3][0] < 255
+        image = img.convert("RGB")
+
+    reference = np.asarray(image)
+    result = {
+        "name": name,
+        "path": path,
+        "kind": classify_image(reference),
+        "original_bytes": len(original),
+        "format": "PNG",
+        "bytes": len(original),
+        "quality": None,
+        "ssim": 1.0,
+        "psnr": None,
+        "original_decode_ms": decode_time(original),
+    }
+    result["decode_ms"] = result["original_decode_ms"]
+
+    # Lossy formats only pay off for photos, and JPEG cannot keep transparency
+    if result["kind"] != "photo" or has_alpha:
+        return result, None
+
+    best_data = None
+    for fmt in formats:
+        found = search_quality(image, reference, fmt, target_ssim)
+        if found is None:
+            continue
+        quality, data, score = found
+        if len(data) < result["bytes"] * (1 - MIN_SAVING):
+            result.update({
+                "format": fmt,
+                "bytes": len(data),
+                "quality": quality,
+                "ssim": score,
+                "psnr": _finite(psnr(reference, _decode(data))),
+                "decode_ms": decode_time(data),
+            })
+            best_data = data
+
+    return result, best_data
+
+
+def apply_result(catalog, result, data):
+    """Replace an imageset's PNG with the transcoded file and point the result at it."""
+    extension = ".jpg" if result["format"] == "JPEG" else ".webp"
+    directory = os.path.dirname(result["path"])
+    filename = result["name"] + extension
+
+    tmp_path = os.path.join(directory, filename + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    # Keep the PNG's modification time, which copy_images_to_assets.py
+    # compares with the source image to tell the file is still current
+    stat = os.stat(result["path"])
+    os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(tmp_path, os.path.join(directory, filename))
+    os.remove(result["path"])
+
+    catalog.set_imageset(result["name"], filename)
+    result["path"] = os.path.join(directory, filename)
+
+
+def main():
+    try:
+        shard, argv = pop_shard_arg(sys.argv[1:])
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    flags = [arg for arg in argv if arg.startswith("--")]
+    args = [arg for arg in argv if not arg.startswith("--")]
+    if len(args) not in (1, 2) or any(flag not in ("--apply", "--webp") for flag in flags):
+        print("Usage: python transcode_images.py <assets_dir> [report_path] [--webp] [--apply] [--shard I/N]")
+        sys.exit(1)
+
+    assets_dir = args[0]
+    report_path = args[1] if len(args) == 2 else None
+    formats = ["JPEG", "WEBP"] if "--webp" in flags else ["JPEG"]
+
+    if not os.path.isdir(assets_dir):
+        print(f"Error: {assets_dir} is not a valid directory")
+        sys.exit(1)
+
+    tasks = [(name, path, formats, DEFAULT_TARGET_SSIM) for name, path in iter_imageset_pngs(assets_dir)]
+    tasks = select_shard(tasks, shard, key=lambda task: task[1], weight=lambda task: os.path.getsize(task[1]))
+    catalog = AssetCatalog.load(assets_dir) if "--apply" in flags else None
+
+    results = []
+    with ProcessPoolExecutor() as executor:
+        for result, data in executor.map(transcode_image, tasks, chunksize=8):
+            results.append(result)
+            if data is not None and catalog is not None:
+                apply_result(catalog, result, data)
+
+    if catalog is not None:
+        catalog.flush()
+
+    changed = [r for r in results if r["format"] != "PNG"]
+    photos = sum(1 for r in results if r["kind"] == "photo")
+    original_bytes = sum(r["original_bytes"] for r in results)
+    new_bytes = sum(r["bytes"] for r in results)
+    original_ms = sum(r["original_decode_ms"] for r in results)
+    new_ms = sum(r["decode_ms"] for r in results)
+
+    print(f"Classified {photos} of {len(results)} images as photographic")
+    print(f"Transcoded {len(changed)} images (target SSIM {DEFAULT_TARGET_SSIM})")
+    print(f"Size: {original_bytes / 1e6:.1f} MB -> {new_bytes / 1e6:.1f} MB")
+    print(f"Decode time: {original_ms:.0f} ms -> {new_ms:.0f} ms")
+    if catalog is None and changed:
+        print("Run with --apply to write the transcoded images to the catalog")
+
+    if report_path:
+        # Sorted by path so merged shard reports match a single-node run exactly
+        results.sort(key=lambda r: r["path"])
+        with open(report_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote report to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+import os
+import sys
+import re
+import json
+
+VOCABULARY_FILES = ["words.json", "short_words.json", "words_flashcard.json"]
+MAPPING_FILE = "word_image_mapping.json"
+
+# How many example words to print for each kind of problem
+MAX_EXAMPLES = 10
+
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+
+
+class _JSONStream:
+    """
+    Incremental reader for a JSON document too large to load at once. Only a
+    small window of the file is kept in memory at any time.
+    """
+
+    def __init__(self, f, chunk_size=1 << 16):
+        self._file = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        if self._eof:
+            return False
+        chunk = self._file.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        # Drop everything already consumed so memory stays constant
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def next_char(self):
+        """Skip whitespace and return the next character without consuming it."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, chars):
+        char = self.next_char()
+        if char not in chars:
+            raise ValueError(f"Expected one of {chars!r} but found {char or 'end of file'!r}")
+        self._pos += 1
+        return char
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.next_char()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and not self._eof and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+def iter_json_array(path):
+    """Yield the elements of a top-level JSON array one at a time."""
+    with open(path, "r", encoding="utf-8") as f:
+        stream = _JSONStream(f)
+        stream.expect("[")
+        if stream.next_char() == "]":
+            return
+        while True:
+            yield stream.value()
+            if stream.expect(",]") == "]":
+                return
+
+
+def iter_json_object(path):
+    """Yield the (key, value) pairs of a top-level JSON object one at a time."""
+    with open(path, "r", encoding="utf-8") as f:
+        stream = _JSONStream(f)
+        stream.expect("{")
+        if stream.next_char() == "}":
+            return
+        while True:
+            key = stream.value()
+            stream.expect(":")
+            yield key, stream.value()
+            if stream.expect(",}") == "}":
+                return
+
+
+# Encoding strings directly skips json.dumps' per-call encoder setup, which
+# otherwise dominates the time spent writing large files
+_encode = json.encoder.encode_basestring
+
+
+class _JSONWriter:
+    """Write a JSON array or object one item at a time in the repo's indent=2 style."""
+
+    def __init__(self, path, is_object=False):
+        self._file = open(path, "w", encoding="utf-8")
+        self._open, self._close = ("{", "}") if is_object else ("[", "]")
+        self._count = 0
+        self._file.write(self._open)
+
+    def _separator(self):
+        self._file.write(",\n  " if self._count else "\n  ")
+        self._count += 1
+
+    def append(self, entry):
+        """Append a flat dict of strings, formatted as json.dumps(indent=2) would."""
+        self._separator()
+        fields = ",\n    ".join(f"{_encode(key)}: {_encode(value)}" for key, value in entry.items())
+        self._file.write(f"{{\n    {fields}\n  }}")
+
+    def item(self, key, value):
+        self._separator()
+        self._file.write(f"{_encode(key)}: {_encode(value)}")
+
+    def close(self):
+        self._file.write(f"\n{self._close}\n" if self._count else f"{self._close}\n")
+        self._file.close()
+
+
+# Swift's CharacterSet.whitespacesAndNewlines: what str.isspace() accepts,
+# minus the ASCII file/group/record/unit separators
+_APP_WHITESPACE = "".join(c for c in map(chr, range(0x10000)) if c.isspace() and c not in "\x1c\x1d\x1e\x1f")
+
+
+def normalize_headword(word):
+    """
+    Normalize a headword exactly the way WordImageManager does at runtime:
+    lowercased, then trimmed. Internal whitespace is left alone, since the
+    app's lookups keep it too.
+    """
+    return word.lower().strip(_APP_WHITESPACE)
+
+
+class _Problem:
+    """Counts occurrences of a problem, keeping only a few examples in memory."""
+
+    def __init__(self):
+        self.count = 0
+        self.examples = []
+
+    def add(self, word):
+        self.count += 1
+        if len(self.examples) < MAX_EXAMPLES:
+            self.examples.append(word)
+
+    def __bool__(self):
+        return self.count > 0
+
+    def __len__(self):
+        return self.count
+
+
+def _examples(words):
+    """Format a sample of words, noting how many more there are."""
+    count = len(words)
+    words = sorted(words.examples if isinstance(words, _Problem) else words)
+    text = ", ".join(words[:MAX_EXAMPLES])
+    if count > MAX_EXAMPLES:
+        text += f", ... ({count - MAX_EXAMPLES} more)"
+    return text
+
+
+def process_vocabulary(path, output_path=None):
+    """
+    Stream a vocabulary file, normalizing and deduplicating headwords.
+    Returns the set of normalized headwords and a dict of problems found.
+    Parsing uses constant memory; only the set of headwords is kept, which
+    the cross-file joins need anyway.
+    """
+    headwords = set()
+    problems = {"invalid": 0, "duplicates": _Problem(), "normalized": _Problem()}
+    writer = _JSONWriter(output_path) if output_path else None
+
+    try:
+        for entry in iter_json_array(path):
+            if not (isinstance(entry, dict)
+                    and isinstance(entry.get("word"), str)
+                    and isinstance(entry.get("meaning"), str)):
+                problems["invalid"] += 1
+                continue
+
+            word = normalize_headword(entry["word"])
+            if not word:
+                problems["invalid"] += 1
+                continue
+            if word != entry["word"]:
+                problems["normalized"].add(entry["word"])
+            if word in headwords:
+                problems["duplicates"].add(word)
+                continue
+
+            headwords.add(word)
+            if writer:
+                writer.append({"word": word, "meaning": entry["meaning"].strip()})
+    finally:
+        if writer:
+            writer.close()
+
+    return headwords, problems
+
+
+def process_mapping(path, output_path=None):
+    """Stream the word to image mapping, normalizing and deduplicating keys."""
+    mapping_words = set()
+    problems = {"invalid": 0, "duplicates": _Problem(), "normalized": _Problem()}
+    writer = _JSONWriter(output_path, is_object=True) if output_path else None
+
+    try:
+        for key, image_file in iter_json_object(path):
+            if not isinstance(image_file, str):
+                problems["invalid"] += 1
+                continue
+
+            word = normalize_headword(key)
+            if word != key:
+                problems["normalized"].add(key)
+            if word in mapping_words:
+                problems["duplicates"].add(word)
+                continue
+
+            mapping_words.add(word)
+            if writer:
+                writer.item(word, image_file)
+    finally:
+        if writer:
+            writer.close()
+
+    return mapping_words, problems
+
+
+def _report(name, count, problems):
+    print(f"{name}: {count} unique headwords")
+    if problems["invalid"]:
+        print(f"  ⚠️ {problems['invalid']} invalid entries skipped")
+    if problems["normalized"]:
+        print(f"  ⚠️ {len(problems['normalized'])} headwords needed normalizing: {_examples(problems['normalized'])}")
+    if problems["duplicates"]:
+        print(f"  ⚠️ {len(problems['duplicates'])} duplicate headwords: {_examples(problems['duplicates'])}")
+    return bool(problems["invalid"] or problems["normalized"] or problems["duplicates"])
+
+
+def validate_vocabulary(vocab_dir, output_dir=None):
+    """
+    Validate the vocabulary files and image mapping in vocab_dir, optionally
+    writing canonical copies to output_dir. Returns True if no problems were found.
+    """
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    def output_path(filename):
+        return os.path.join(output_dir, filename) if output_dir else None
+
+    ok = True
+    styles = {}
+    for filename in VOCABULARY_FILES:
+        path = os.path.join(vocab_dir, filename)
+        if not os.path.exists(path):
+            print(f"Warning: {path} does not exist")
+            continue
+        styles[filename], problems = process_vocabulary(path, output_path(filename))
+        ok = not _report(filename, len(styles[filename]), problems) and ok
+
+    mapping_path = os.path.join(vocab_dir, MAPPING_FILE)
+    mapping_words = None
+    if os.path.exists(mapping_path):
+        mapping_words, problems = process_mapping(mapping_path, output_path(MAPPING_FILE))
+        ok = not _report(MAPPING_FILE, len(mapping_words), problems) and ok
+
+    # Set joins across the styles: every word should exist in every file
+    all_words = set().union(*styles.values()) if styles else set()
+    for filename, headwords in styles.items():
+        missing = all_words - headwords
+        if missing:
+            print(f"⚠️ {len(missing)} words missing from {filename}: {_examples(missing)}")
+            ok = False
+
+    if mapping_words is not None:
+        without_image = all_words - mapping_words
+        orphaned = mapping_words - all_words
+        if without_image:
+            print(f"⚠️ {len(without_image)} words have no image: {_examples(without_image)}")
+        if orphaned:
+            print(f"⚠️ {len(orphaned)} images map to unknown words: {_examples(orphaned)}")
+            ok = False
+
+    return ok
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python validate_vocabulary.py <vocabulary_dir> [output_dir]")
+        sys.exit(1)
+
+    vocab_dir = sys.argv[1]
+    output_dir = sys.argv[2] if len(sys.argv) == 3 else None
+
+    if not os.path.isdir(vocab_dir):
+        print(f"Error: {vocab_dir} is not a valid directory")
+        sys.exit(1)
+
+    if os.path.abspath(vocab_dir) == os.path.abspath(output_dir or ""):
+        print("Error: output_dir must be different from vocabulary_dir")
+        sys.exit(1)
+
+    ok = validate_vocabulary(vocab_dir, output_dir)
+    if output_dir:
+        print(f"Wrote canonical files to {output_dir}")
+
+    if ok:
+        print("✅ Vocabulary files are consistent")
+    else:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()